@@ -2,38 +2,53 @@
     designed by Joshua Buergel
 
     Complete website with frontend and server using Flask, SocketIO and vanilla JS
+
+    Importing the package is cheap: the rules engine and AIs are in foxy.engine and
+    the Flask app is only created by create_app(), or on first access to foxy.app
 """
+from __future__ import annotations
+from typing import Any
+
+EXTENSIONS = ("db", "migrate", "bcrypt", "login_manager", "socketio", "babel",
+              "redis_server", "redis_queue")
+"""Names of foxy.extensions that can also be imported from foxy"""
+
+_app = None
+
+def create_app() -> Any:
+    """Create the Flask app of the web site and attach the extensions to it"""
+    from flask import Flask, request
+    from foxy.extensions import db, migrate, bcrypt, login_manager, socketio, babel
+
+    app = Flask(__name__, instance_relative_config=True)
+    app.config.from_object('config')
+    app.config.from_pyfile('config.py')
+    db.init_app(app)
+    migrate.init_app(app, db)
+    bcrypt.init_app(app)
+    login_manager.init_app(app)
+    socketio.init_app(app, message_queue='redis://')
+
+    def get_locale():
+        return request.accept_languages.best_match(app.config['LANGUAGES'])
+
+    babel.init_app(app, locale_selector=get_locale)
+    return app
+
+def get_app() -> Any:
+    """Returns the Flask app of the web site with its routes, created on first call"""
+    global _app
+    if _app is None:
+        _app = create_app()
+        _app.app_context().push()
+        from foxy import routes
+    return _app
 
-from flask import Flask, request
-from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from flask_bcrypt import Bcrypt
-from flask_login import LoginManager
-from flask_socketio import SocketIO
-from flask_babel import Babel
-from flask_babel import lazy_gettext as _l
-import redis
-from rq import Queue
-
-app = Flask(__name__, instance_relative_config=True)
-app.app_context().push()
-app.config.from_object('config')
-app.config.from_pyfile('config.py')
-db = SQLAlchemy(app)
-migrate = Migrate(app, db, render_as_batch=True)
-bcrypt = Bcrypt(app)
-login_manager = LoginManager(app)
-login_manager.login_view = 'login'
-login_manager.login_message = _l('Please log in to access this page.')
-login_manager.login_message_category = 'info'
-socketio = SocketIO(app, message_queue='redis://')
-babel = Babel(app)
-redis_server = redis.Redis()
-redis_queue = Queue(connection=redis_server)
-
-def get_locale():
-    return request.accept_languages.best_match(app.config['LANGUAGES'])
-
-babel.init_app(app, locale_selector=get_locale)
-
-from foxy import routes
+def __getattr__(name: str) -> Any:
+    """Create the app when foxy.app is first used, give access to the extensions"""
+    if name == "app":
+        return get_app()
+    if name in EXTENSIONS:
+        from foxy import extensions
+        return getattr(extensions, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,6 @@
+"""Rules engine and AIs of Fox in the Forest
+
+Only depends on the standard library (and NumPy for the batch engine and the
+benchmarks): importing it does not create the Flask app, so it can be used by
+task queue workers, benchmarks and offline scripts at the cost of the engine alone.
+"""
@@ -0,0 +1,188 @@
+"""Vectorized batch engine for the Fox in the Forest game
+
+Advances N games at once with NumPy array operations, using the compact card
+encoding of foxintheforest.py (cards are ints from 0 to 32).
+
+A batch is a dict of arrays with the following keys (N is the number of games):
+    hands: (N, 2, 33) bool, cards in the hand of each player
+    discards: (N, 2, 33) bool, cards won by each player
+    private_discards: (N, 2, 33) bool, cards secretely discarded by each player
+    trick: (N, 2) int8, cards of the current trick (NO_CARD if not played)
+    current_player: (N,) int8, next player to play
+    leading_player: (N,) int8, player leading the current trick
+    trump_card: (N,) int8, current trump card (NO_CARD while it is exchanged)
+    draw_deck: (N, 6) int8, draw deck padded with NO_CARD
+    drawn: (N,) int8, number of cards already picked from the draw deck
+    special_type: (N,) int8, pending special play (3 or 5, 0 if none)
+"""
+from __future__ import annotations
+from typing import List, Dict, Tuple
+from array import array
+
+import numpy as np
+
+from foxy.engine.foxintheforest import (
+    CompactState, DECK_SIZE, NB_CARDS, NO_CARD, CARD_VALUES, FOLLOW_MASKS, ONE_MASKS,
+    SEVENS_MASK, TRICK_POINTS, TRICK_WINNERS, mask_to_ints
+)
+
+Batch = Dict[str, np.ndarray]
+
+_VALUES: np.ndarray = np.array(CARD_VALUES, dtype=np.int8)
+_SUITS: np.ndarray = np.arange(NB_CARDS, dtype=np.int16) // 11
+_SEVENS: np.ndarray = np.array([SEVENS_MASK >> n & 1 for n in range(NB_CARDS)], dtype=bool)
+_TRICK_POINTS: np.ndarray = np.array(TRICK_POINTS, dtype=np.int16)
+_WINNERS: np.ndarray = np.array([winner for winner, _ in TRICK_WINNERS], dtype=np.int8)
+_NEXT_LEADERS: np.ndarray = np.array([leader for _, leader in TRICK_WINNERS], dtype=np.int8)
+
+def _mask_to_bools(mask: int) -> np.ndarray:
+    """Returns the (33,) bool array of a card mask"""
+    return np.array([mask >> n & 1 for n in range(NB_CARDS)], dtype=bool)
+
+def _bools_to_mask(cards: np.ndarray) -> int:
+    """Returns the card mask of a (33,) bool array"""
+    return sum(1 << int(n) for n in np.flatnonzero(cards))
+
+_FOLLOW: np.ndarray = np.array([_mask_to_bools(mask) for mask in FOLLOW_MASKS])
+"""(33, 33) cards following the suit of each card"""
+_ONES: np.ndarray = np.array([_mask_to_bools(mask) for mask in ONE_MASKS])
+"""(33, 33) 1 of the suit of each card"""
+
+def new_batch(cstates: List[CompactState]) -> Batch:
+    """Returns a batch made of the given compact states"""
+    size: int = len(cstates)
+    batch: Batch = {
+        "hands": np.zeros((size, 2, NB_CARDS), dtype=bool),
+        "discards": np.zeros((size, 2, NB_CARDS), dtype=bool),
+        "private_discards": np.zeros((size, 2, NB_CARDS), dtype=bool),
+        "trick": np.array([cstate["trick"] for cstate in cstates], dtype=np.int8).reshape(size, 2),
+        "current_player": np.array([cstate["current_player"] for cstate in cstates], dtype=np.int8),
+        "leading_player": np.array([cstate["leading_player"] for cstate in cstates], dtype=np.int8),
+        "trump_card": np.array([cstate["trump_card"] for cstate in cstates], dtype=np.int8),
+        "draw_deck": np.full((size, DECK_SIZE), NO_CARD, dtype=np.int8),
+        "drawn": np.zeros(size, dtype=np.int8),
+        "special_type": np.array([cstate["special_type"] or 0 for cstate in cstates],
+                                 dtype=np.int8)
+    }
+    for game, cstate in enumerate(cstates):
+        for player in range(2):
+            batch["hands"][game, player, mask_to_ints(cstate["hands"][player])] = True
+            batch["discards"][game, player, mask_to_ints(cstate["discards"][player])] = True
+            batch["private_discards"][game, player,
+                                      mask_to_ints(cstate["private_discards"][player])] = True
+        batch["draw_deck"][game, :len(cstate["draw_deck"])] = cstate["draw_deck"]
+    return batch
+
+def repeat_batch(cstate: CompactState, size: int) -> Batch:
+    """Returns a batch made of size copies of the given compact state"""
+    single: Batch = new_batch([cstate])
+    return {key: np.repeat(array, size, axis=0) for key, array in single.items()}
+
+def copy_batch(batch: Batch) -> Batch:
+    """Output a cloned copy of the given batch"""
+    return {key: array.copy() for key, array in batch.items()}
+
+def get_compact_state(batch: Batch, game: int) -> CompactState:
+    """Returns the compact state of one game of the batch"""
+    special_type: int = int(batch["special_type"][game])
+    deck: np.ndarray = batch["draw_deck"][game, batch["drawn"][game]:]
+    cstate: CompactState = {
+        "private_discards": [_bools_to_mask(batch["private_discards"][game, 0]),
+                             _bools_to_mask(batch["private_discards"][game, 1])],
+        "trick": [int(card) for card in batch["trick"][game]],
+        "current_player": int(batch["current_player"][game]),
+        "leading_player": int(batch["leading_player"][game]),
+        "discards": [_bools_to_mask(batch["discards"][game, 0]),
+                     _bools_to_mask(batch["discards"][game, 1])],
+        "hands": [_bools_to_mask(batch["hands"][game, 0]),
+                  _bools_to_mask(batch["hands"][game, 1])],
+        "trump_card": int(batch["trump_card"][game]),
+        "draw_deck": array('b', [int(card) for card in deck if card != NO_CARD]),
+        "special_type": special_type if special_type else None
+    }
+    return cstate
+
+def is_finished(batch: Batch) -> np.ndarray:
+    """Returns a (N,) bool array, True for games where all cards have been played"""
+    return ~batch["hands"].any(axis=(1, 2))
+
+def batch_trick_winner(leading_player: np.ndarray, card0: np.ndarray, card1: np.ndarray,
+                       trump_card: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the winners of tricks as well as the next leading players"""
+    index: np.ndarray = (((leading_player.astype(np.int32) * 3 + _SUITS[trump_card]) * NB_CARDS
+                          + card0) * NB_CARDS + card1)
+    return _WINNERS[index], _NEXT_LEADERS[index]
+
+def batch_allowed(batch: Batch) -> np.ndarray:
+    """Returns a (N, 33) bool array of the cards allowed for the current player of each game"""
+    games: np.ndarray = np.arange(len(batch["current_player"]))
+    player: np.ndarray = batch["current_player"]
+    hand: np.ndarray = batch["hands"][games, player]
+    other_card: np.ndarray = batch["trick"][games, 1 - player]
+    follow: np.ndarray = (batch["special_type"] == 0) & (other_card != NO_CARD)
+    other_card = np.where(follow, other_card, 0)
+    same_suit: np.ndarray = hand & _FOLLOW[other_card]
+    follow &= same_suit.any(axis=1)
+    # Force best card or 1
+    forced: np.ndarray = same_suit & _ONES[other_card]
+    best: np.ndarray = NB_CARDS - 1 - same_suit[:, ::-1].argmax(axis=1)
+    forced[games, best] = True
+    same_suit = np.where((_VALUES[other_card] == 11)[:, None], forced, same_suit)
+    return np.where(follow[:, None], same_suit, hand)
+
+def batch_do_step(batch: Batch, cards: np.ndarray, active: np.ndarray) -> None:
+    """Play the given card for the current player of each active game, in place"""
+    games: np.ndarray = np.flatnonzero(active)
+    cards = cards[games]
+    player: np.ndarray = batch["current_player"][games]
+    special_type: np.ndarray = batch["special_type"][games]
+    batch["hands"][games, player, cards] = False
+
+    first: np.ndarray = special_type == 0
+    three: np.ndarray = first & (_VALUES[cards] == 3)
+    five: np.ndarray = first & (_VALUES[cards] == 5)
+    batch["trick"][games[first], player[first]] = cards[first]
+    # 3: take the trump card, the next play is the new trump card
+    batch["hands"][games[three], player[three], batch["trump_card"][games[three]]] = True
+    batch["trump_card"][games[three]] = NO_CARD
+    batch["trump_card"][games[special_type == 3]] = cards[special_type == 3]
+    # 5: draw a card, the next play is discarded
+    drawn: np.ndarray = batch["drawn"][games[five]]
+    batch["hands"][games[five], player[five], batch["draw_deck"][games[five], drawn]] = True
+    batch["drawn"][games[five]] += 1
+    batch["private_discards"][games[special_type == 5], player[special_type == 5],
+                              cards[special_type == 5]] = True
+    special_type = np.where(three, 3, np.where(five, 5, 0)).astype(np.int8)
+    batch["special_type"][games] = special_type
+
+    games = games[special_type == 0]
+    player = player[special_type == 0]
+    trick: np.ndarray = batch["trick"][games]
+    complete: np.ndarray = (trick != NO_CARD).all(axis=1)
+    batch["current_player"][games[~complete]] = 1 - player[~complete]
+    games = games[complete]
+    trick = trick[complete]
+    winner, leader = batch_trick_winner(batch["leading_player"][games], trick[:, 0], trick[:, 1],
+                                        batch["trump_card"][games])
+    batch["discards"][games, winner, trick[:, 0]] = True
+    batch["discards"][games, winner, trick[:, 1]] = True
+    batch["trick"][games] = NO_CARD
+    batch["leading_player"][games] = leader
+    batch["current_player"][games] = leader
+
+def batch_random_playout(batch: Batch, rng: np.random.Generator) -> None:
+    """Play uniformly random allowed cards until the end of every game of the batch, in place"""
+    active: np.ndarray = ~is_finished(batch)
+    while active.any():
+        keys: np.ndarray = rng.random((len(active), NB_CARDS))
+        keys[~batch_allowed(batch)] = -1
+        batch_do_step(batch, keys.argmax(axis=1), active)
+        active = ~is_finished(batch)
+
+def batch_get_score(batch: Batch) -> np.ndarray:
+    """Get the (N, 2) scores of the games of the batch, see foxintheforest.get_score()"""
+    tricks_won: np.ndarray = batch["discards"].sum(axis=2) // 2
+    score: np.ndarray = (batch["discards"] & _SEVENS).sum(axis=2).astype(np.int16)
+    finished: np.ndarray = tricks_won.sum(axis=1) == 13
+    score[finished] += _TRICK_POINTS[tricks_won[finished]]
+    return score
@@ -0,0 +1,228 @@
+"""Micro-benchmarks of the Fox in the Forest engine
+
+Each metric is a number of operations per second, measured on games dealt and
+played with fixed seeds so that results can be compared between versions.
+
+Usage:
+    python -m foxy.engine.benchmark [--output results.json]
+    python -m foxy.engine.benchmark --compare baseline.json [--threshold 0.2]
+
+With --compare, the exit code is 1 if any metric is slower than the baseline
+by more than the threshold (a fraction of the baseline value).
+"""
+from __future__ import annotations
+from typing import List, Dict, Tuple, Callable, Union
+import argparse
+from itertools import cycle
+import json
+import platform
+import random
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from foxy.engine import foxintheforest, batch, determinization, good_ai, rollout
+from foxy.engine.foxintheforest import Game, State, Play
+
+Results = Dict[str, float]
+
+SEED: int = 1
+"""Seed of the games used by the benchmarks"""
+
+NB_GAMES: int = 20
+"""Number of games used by the benchmarks"""
+
+MIN_DURATION: float = 0.5
+"""Minimum measuring time of each metric (seconds)"""
+
+BATCH_SIZE: int = 500
+"""Number of games played at once by the batch engine benchmark"""
+
+THRESHOLD: float = 0.2
+"""Default relative slowdown tolerated before a metric is reported as a regression"""
+
+REPEATS: int = 5
+"""Number of measures of each metric, the best one is kept"""
+
+def _rate(run: Callable[[], int], min_duration: float) -> float:
+    """Returns the number of operations per second done by run()
+        run() returns the number of operations it did, it is called until min_duration/REPEATS
+        is reached, REPEATS times, and the best rate is kept to limit noise"""
+    best: float = 0
+    for _ in range(REPEATS):
+        count: int = 0
+        elapsed: float = 0
+        while True:
+            start: float = perf_counter()
+            count += run()
+            elapsed += perf_counter() - start
+            if elapsed >= min_duration / REPEATS:
+                break
+        best = max(best, count / elapsed)
+    return best
+
+def sample_games(nb_games: int = NB_GAMES, seed: int = SEED) -> List[Game]:
+    """Returns finished games, dealt and played randomly with the given seed"""
+    random.seed(seed)
+    games: List[Game] = []
+    for _ in range(nb_games):
+        game_state = foxintheforest.GameState(foxintheforest.new_game())
+        while not game_state.is_finished():
+            game_state.apply_play(random.choice(foxintheforest.list_allowed(
+                game_state.state, game_state.state["current_player"])))
+        games.append(game_state.game)
+    return games
+
+def _positions(games: List[Game]) -> List[Tuple[Game, State, Play]]:
+    """Returns every (game so far, state, next play) of the given games"""
+    positions: List[Tuple[Game, State, Play]] = []
+    for game in games:
+        partial: Game = foxintheforest.copy_game(game)
+        partial["plays"] = []
+        for step in game["plays"]:
+            positions.append((foxintheforest.copy_game(partial),
+                              foxintheforest.get_state_from_game(partial), step))
+            partial["plays"].append(step)
+    return positions
+
+def run_benchmarks(min_duration: float = MIN_DURATION) -> Results:
+    """Run all benchmarks and returns their results (operations per second)"""
+    games: List[Game] = sample_games()
+    positions: List[Tuple[Game, State, Play]] = _positions(games)
+    results: Results = {}
+
+    def measure(name: str, run: Callable[[], int]) -> None:
+        random.seed(SEED)
+        results[name] = _rate(run, min_duration)
+
+    def measure_calls(name: str, func: Callable, arguments: List[Tuple]) -> None:
+        next_arguments: Callable[[], Tuple] = cycle(arguments).__next__
+        def run() -> int:
+            func(*next_arguments())
+            return 1
+        measure(name, run)
+
+    measure_calls("new_game", foxintheforest.new_game, [()])
+    for length in [0, 10, 20, None]:
+        truncated: List[Tuple[Game]] = []
+        for game in games:
+            truncated.append((foxintheforest.copy_game(game),))
+            truncated[-1][0]["plays"] = game["plays"][:length]
+        measure_calls(f"get_state_from_game[{length if length is not None else 'all'}]",
+                      foxintheforest.get_state_from_game, truncated)
+
+    next_game: Callable[[], Game] = cycle(games).__next__
+    def replay() -> int:
+        game: Game = next_game()
+        initial: Game = foxintheforest.copy_game(game)
+        initial["plays"] = []
+        state: State = foxintheforest.get_state_from_game(initial)
+        special_type: Union[int, None] = None
+        for step in game["plays"]:
+            state, special_type = foxintheforest.do_step(state, step, special_type)
+        return len(game["plays"])
+    measure("do_step", replay)
+
+    measure_calls("list_allowed", foxintheforest.list_allowed,
+                  [(state, state["current_player"]) for _, state, _ in positions])
+    measure_calls("valid_step", foxintheforest.valid_step,
+                  [(state, step) for _, state, step in positions])
+    measure_calls("get_player_game", foxintheforest.get_player_game,
+                  [(game, player) for game in games for player in range(2)])
+
+    views: List[Tuple[State, good_ai.Knowledge]] = []
+    for game, state, _ in positions:
+        view: State = foxintheforest.get_state_from_game(
+            foxintheforest.get_player_game(game, state["current_player"]))
+        views.append((view, good_ai.aquire_knowledge(view)))
+    measure_calls("aquire_knowledge", good_ai.aquire_knowledge, [(view,) for view, _ in views])
+    measure_calls("random_state", good_ai.random_state, views)
+    measure_calls("random_hidden_cards", good_ai.random_hidden_cards, views)
+
+    determinization_rng: np.random.Generator = np.random.default_rng(SEED)
+    next_view: Callable[[], Tuple[State, good_ai.Knowledge]] = cycle(views).__next__
+    def sample_determinizations() -> int:
+        view, knowledge = next_view()
+        opponent: int = 1 - view["current_player"]
+        determinization.sample_hidden_masks(knowledge, len(view["hands"][opponent]),
+                                            len(view["private_discards"][opponent]),
+                                            good_ai.DETERMINIZATIONS, determinization_rng)
+        return good_ai.DETERMINIZATIONS
+    measure("batch_determinizations", sample_determinizations)
+
+    initial_states: List[foxintheforest.CompactState] = []
+    for game in games:
+        initial: Game = foxintheforest.copy_game(game)
+        initial["plays"] = []
+        initial_states.append(foxintheforest.compact_state(
+            foxintheforest.get_state_from_game(initial)))
+    next_initial_state: Callable[[], foxintheforest.CompactState] = cycle(initial_states).__next__
+    def playout() -> int:
+        cstate: foxintheforest.CompactState = foxintheforest.copy_compact_state(
+            next_initial_state())
+        while cstate["hands"][0] or cstate["hands"][1]:
+            foxintheforest.compact_do_step(cstate, random.choice(
+                foxintheforest.compact_list_allowed(cstate)))
+        foxintheforest.compact_get_score(cstate)
+        return 1
+    measure("playouts", playout)
+
+    def heuristic_playout() -> int:
+        cstate: foxintheforest.CompactState = foxintheforest.copy_compact_state(
+            next_initial_state())
+        while cstate["hands"][0] or cstate["hands"][1]:
+            foxintheforest.compact_do_step(cstate, rollout.heuristic_policy(
+                cstate, foxintheforest.compact_list_allowed(cstate)))
+        foxintheforest.compact_get_score(cstate)
+        return 1
+    measure("heuristic_playouts", heuristic_playout)
+
+    rng: np.random.Generator = np.random.default_rng(SEED)
+    def batch_playout() -> int:
+        games_batch: batch.Batch = batch.repeat_batch(next_initial_state(), BATCH_SIZE)
+        batch.batch_random_playout(games_batch, rng)
+        batch.batch_get_score(games_batch)
+        return BATCH_SIZE
+    measure("batch_playouts", batch_playout)
+    return results
+
+def compare_results(results: Results, baseline: Results,
+                    threshold: float = THRESHOLD) -> List[str]:
+    """Returns a description of each metric slower than the baseline by more than threshold"""
+    regressions: List[str] = []
+    for name, reference in baseline.items():
+        if name in results and results[name] < reference * (1 - threshold):
+            regressions.append(f"{name}: {results[name]:.1f}/s, baseline {reference:.1f}/s "
+                               f"({results[name]/reference - 1:+.1%})")
+    return regressions
+
+def main(argv: Union[List[str], None] = None) -> int:
+    """Command line entry point, returns the exit code"""
+    parser = argparse.ArgumentParser(description="Fox in the Forest engine micro-benchmarks")
+    parser.add_argument("-o", "--output", help="JSON file to store the results in")
+    parser.add_argument("-c", "--compare", help="JSON file of baseline results to compare with")
+    parser.add_argument("-t", "--threshold", type=float, default=THRESHOLD,
+                        help="relative slowdown tolerated before failing the comparison")
+    parser.add_argument("-d", "--duration", type=float, default=MIN_DURATION,
+                        help="minimum measuring time of each metric (seconds)")
+    args = parser.parse_args(argv)
+
+    results: Results = run_benchmarks(args.duration)
+    for name, value in results.items():
+        print(f"{name:30} {value:12.1f}/s")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"python": platform.python_version(), "results": results}, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline: Results = json.load(file)["results"]
+        regressions: List[str] = compare_results(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Regression {regression}")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""Offline builder of the opening book of the Fox in the Forest AIs
+
+Deals seeded random games and runs deep good_ai searches, on a pool of
+processes, for the first decision of the leading player and for the first
+decision of the other player after a random lead, then writes in a book file
+(see opening_book.py) the abstract play chosen most often for each key.
+
+Usage:
+    python -m foxy.engine.build_opening_book book.bin [--deals 1000] [--runs 20000]
+        [--workers 4] [--seed 1] [--merge]
+
+With --merge, the positions of an existing book file are kept.
+"""
+from __future__ import annotations
+from typing import List, Dict, Tuple, Union
+import argparse
+from collections import Counter
+from multiprocessing import Pool
+import os
+import random
+import sys
+
+from foxy.engine import foxintheforest, good_ai
+from foxy.engine.foxintheforest import CARD_VALUES, Game, Play, card_to_int
+from foxy.engine.opening_book import abstract_play, opening_position, read_book, write_book
+
+NB_DEALS: int = 100
+"""Default number of deals searched"""
+
+NB_RUNS: int = 20000
+"""Default number of simulations of each search"""
+
+SEED: int = 1
+"""Default seed of the first deal"""
+
+def opening_positions(nb_deals: int, seed: int = SEED) -> List[Game]:
+    """Returns the get_player_game() views of the opening positions of seeded deals: the
+    leading player before any play and, when the lead is not a 3 or a 5, the other player
+    after a random lead"""
+    positions: List[Game] = []
+    for deal in range(nb_deals):
+        random.seed(seed + deal)
+        game: Game = foxintheforest.new_game()
+        leader: int = game["first_player"]
+        positions.append(foxintheforest.get_player_game(game, leader))
+        state = foxintheforest.get_state_from_game(game)
+        leads: List[Play] = [play for play in foxintheforest.list_allowed(state, leader)
+                             if CARD_VALUES[card_to_int(play[1])] not in (3, 5)]
+        if leads:
+            foxintheforest.apply_play(game, random.choice(leads))
+            positions.append(foxintheforest.get_player_game(game, 1 - leader))
+    return positions
+
+def _search_position(arguments: Tuple[Game, int, int]) -> Tuple[int, int]:
+    """Returns the book key of a position and the abstract play chosen by a search"""
+    game, runs, position_seed = arguments
+    random.seed(position_seed)
+    key, suits = opening_position(game)
+    play: Play = good_ai.select_play(game, None, runs)
+    return key, abstract_play(game, suits, card_to_int(play[1]))
+
+def build_book(nb_deals: int = NB_DEALS, runs: int = NB_RUNS, workers: Union[int, None] = None,
+               seed: int = SEED) -> Dict[int, int]:
+    """Search the opening positions of nb_deals deals on a pool of workers and returns the
+    abstract play chosen most often by key"""
+    arguments: List[Tuple[Game, int, int]] = [
+        (game, runs, seed + number) for number, game in enumerate(opening_positions(nb_deals,
+                                                                                     seed))]
+    votes: Dict[int, Counter] = {}
+    with Pool(workers) as pool:
+        for key, play in pool.imap_unordered(_search_position, arguments):
+            votes.setdefault(key, Counter())[play] += 1
+    return {key: counter.most_common(1)[0][0] for key, counter in votes.items()}
+
+def main(argv: Union[List[str], None] = None) -> int:
+    """Command line entry point, returns the exit code"""
+    parser = argparse.ArgumentParser(description="Build the opening book of the AIs")
+    parser.add_argument("output", help="path of the book file")
+    parser.add_argument("-d", "--deals", type=int, default=NB_DEALS, help="number of deals")
+    parser.add_argument("-r", "--runs", type=int, default=NB_RUNS,
+                        help="number of simulations of each search")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="number of processes (default: number of CPUs)")
+    parser.add_argument("-s", "--seed", type=int, default=SEED, help="seed of the first deal")
+    parser.add_argument("-m", "--merge", action="store_true",
+                        help="keep the positions of the existing book file")
+    args = parser.parse_args(argv)
+
+    entries: Dict[int, int] = {}
+    if args.merge and os.path.exists(args.output):
+        entries = read_book(args.output)
+    entries.update(build_book(args.deals, args.runs, args.workers, args.seed))
+    write_book(args.output, entries)
+    print(f"{len(entries)} positions written to {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
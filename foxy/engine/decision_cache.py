@@ -0,0 +1,179 @@
+"""Cache of the decisions of the Fox in the Forest AIs by information set
+
+A decision is stored as the visits and total reward of each play at the root of
+the search (see good_ai.root_statistics()), keyed by a hash of what the player
+knows of the game (its get_player_game() view) and of the search settings, so
+that a position seen again, by the same process or another worker, is answered
+without searching. Views are hashed in their canonical suit relabelling (see
+symmetry.py), so the plays of a decision are stored relabelled the same way and
+positions equivalent by suit share their decisions.
+
+Backends only store text values with a time to live:
+    DictBackend: in the process memory, least recently used entries are dropped
+    FileBackend: in a local SQLite file, least recently used entries are dropped
+    RedisBackend: on a Redis server, under a key prefix with an index of the keys
+        by last use, least recently used entries are dropped
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Tuple, Union
+from collections import OrderedDict
+import hashlib
+import json
+import sqlite3
+from time import time
+
+from foxy.engine.foxintheforest import Game
+from foxy.engine.symmetry import canonical_game
+
+RootStatistics = Dict[int, Tuple[int, float]]
+
+CACHE_TTL: float = 7 * 24 * 3600
+"""Default time to live of a decision (seconds)"""
+
+MAX_ENTRIES: int = 100000
+"""Default maximum number of decisions of a backend"""
+
+REDIS_PREFIX: str = "foxy:decision:"
+"""Prefix of the Redis keys of the decisions"""
+
+class DictBackend():
+    """Decisions stored in a dict of the process
+    Args:
+        max_entries (int): maximum number of decisions kept
+    """
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        self.max_entries: int = max_entries
+        self.entries: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+
+    def get(self, key: str) -> Union[str, None]:
+        """Returns the value of the key, None if missing or expired"""
+        entry: Union[Tuple[float, str], None] = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Store the value of the key for ttl seconds"""
+        self.entries[key] = (time() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+class FileBackend():
+    """Decisions stored in a SQLite file, that can be shared by the processes of a machine
+    Args:
+        path (str): path of the file
+        max_entries (int): maximum number of decisions kept
+    """
+    def __init__(self, path: str, max_entries: int = MAX_ENTRIES) -> None:
+        self.max_entries: int = max_entries
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS decisions (key TEXT PRIMARY KEY, "
+                                "value TEXT, expires REAL, used REAL)")
+        self.connection.commit()
+
+    def get(self, key: str) -> Union[str, None]:
+        """Returns the value of the key, None if missing or expired"""
+        now: float = time()
+        row: Union[Tuple[str, float], None] = self.connection.execute(
+            "SELECT value, expires FROM decisions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] < now:
+            self.connection.execute("DELETE FROM decisions WHERE key = ?", (key,))
+            self.connection.commit()
+            return None
+        self.connection.execute("UPDATE decisions SET used = ? WHERE key = ?", (now, key))
+        self.connection.commit()
+        return row[0]
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Store the value of the key for ttl seconds"""
+        now: float = time()
+        self.connection.execute("INSERT OR REPLACE INTO decisions VALUES (?, ?, ?, ?)",
+                                (key, value, now + ttl, now))
+        self.connection.execute("DELETE FROM decisions WHERE key IN (SELECT key FROM decisions "
+                                "ORDER BY used DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+        self.connection.commit()
+
+class RedisBackend():
+    """Decisions stored on a Redis server, shared by all the workers using it
+        the server is shared with the job queue, so decisions are only stored under the
+        prefix and their keys are indexed by last use in a sorted set (the prefix followed
+        by "index"), trimmed to max_entries
+    Args:
+        connection (Redis): connection to the server
+        prefix (str): prefix of the keys
+        max_entries (int): maximum number of decisions kept
+    """
+    def __init__(self, connection: Any, prefix: str = REDIS_PREFIX,
+                 max_entries: int = MAX_ENTRIES) -> None:
+        self.connection: Any = connection
+        self.prefix: str = prefix
+        self.index: str = prefix + "index"
+        self.max_entries: int = max_entries
+
+    def get(self, key: str) -> Union[str, None]:
+        """Returns the value of the key, None if missing or expired"""
+        value: Union[bytes, str, None] = self.connection.get(self.prefix + key)
+        if value is None:
+            return None
+        self.connection.zadd(self.index, {key: time()})
+        if isinstance(value, bytes):
+            return value.decode()
+        return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Store the value of the key for ttl seconds"""
+        self.connection.set(self.prefix + key, value, ex=max(1, int(ttl)))
+        self.connection.zadd(self.index, {key: time()})
+        nb_dropped: int = self.connection.zcard(self.index) - self.max_entries
+        if nb_dropped > 0:
+            dropped: List[Union[bytes, str]] = self.connection.zrange(self.index, 0,
+                                                                      nb_dropped - 1)
+            self.connection.delete(*[self.prefix + (name.decode() if isinstance(name, bytes)
+                                                    else name) for name in dropped])
+            self.connection.zrem(self.index, *dropped)
+
+Backend = Union[DictBackend, FileBackend, RedisBackend]
+
+def information_set_key(game: Game, settings: Dict[str, Any]) -> str:
+    """Returns the key of the information set of the player of a get_player_game() view,
+    with the search settings, the same for all the views equivalent by suit relabelling"""
+    game = canonical_game(game)[0]
+    player: int = game["player"]
+    view: Dict[str, Any] = {
+        "player": player,
+        "first_player": game["first_player"],
+        "trump_card": game["init_trump_card"],
+        "hand": sorted(game["init_hands"][player], key=lambda card: (card[1], card[0])),
+        "drawn": [card for card in game["init_draw_deck"] if card[0] is not None],
+        "plays": game["plays"]
+    }
+    text: str = json.dumps([view, settings], sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+class DecisionCache():
+    """Root statistics of past searches by information set
+    Args:
+        backend (Backend): storage of the decisions
+        ttl (float): time to live of the decisions (seconds)
+    """
+    def __init__(self, backend: Backend, ttl: float = CACHE_TTL) -> None:
+        self.backend: Backend = backend
+        self.ttl: float = ttl
+
+    def get(self, key: str) -> Union[RootStatistics, None]:
+        """Returns the root statistics stored for the key, None if there are none"""
+        value: Union[str, None] = self.backend.get(key)
+        if value is None:
+            return None
+        return {int(play): (visits, reward) for play, (visits, reward) in json.loads(value).items()}
+
+    def store(self, key: str, statistics: RootStatistics) -> None:
+        """Store the root statistics of the key"""
+        self.backend.set(key, json.dumps(statistics), self.ttl)
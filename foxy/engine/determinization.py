@@ -0,0 +1,108 @@
+"""Batched determinizations of the hidden cards for the Fox in the Forest AIs
+
+Samples at once many possible opponent hands, opponent private discards and
+draw decks satisfying the knowledge of good_ai.update_knowledge(), with the
+same distribution as good_ai.random_hidden_cards(), as NumPy arrays in the
+layout of batch.py. The constraints on the cards are:
+    remaining: cards that may be in the opponent hand
+    draw_deck: hidden cards that cannot be in the opponent hand
+    opponent_hand: cards known to be in the opponent hand
+    max_one: cards of the suits the opponent has at most one card of
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from foxy.engine.batch import Batch, repeat_batch, _mask_to_bools
+from foxy.engine.foxintheforest import (
+    CompactState, CardInt, Mask, CARD_SUITS, DECK_SIZE, NB_CARDS, NO_CARD, SUIT_MASKS,
+    mask_to_ints
+)
+
+Knowledge = Dict[str, Any]
+
+_SUIT_INDEXES: np.ndarray = np.array(CARD_SUITS, dtype=np.int8)
+_BITS: np.ndarray = np.array([1 << n for n in range(NB_CARDS)], dtype=np.int64)
+
+def sample_hidden_cards(knowledge: Knowledge, nb_hand: int, nb_private: int, size: int,
+                        rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns size random determinizations of the cards hidden to the player of the knowledge
+        nb_hand: number of cards in the opponent hand
+        nb_private: number of private discards of the opponent
+    as a (size, 33) bool array of the opponent hands, a (size, 33) bool array of the opponent
+    private discards and a (size, 6) int8 array of draw decks padded with NO_CARD"""
+    remaining: np.ndarray = np.array(mask_to_ints(knowledge["remaining"]), dtype=np.intp)
+    draw_deck: np.ndarray = np.array(mask_to_ints(knowledge["draw_deck"]), dtype=np.intp)
+    hands: np.ndarray = np.repeat(_mask_to_bools(knowledge["opponent_hand"])[None], size, axis=0)
+    nb_unknown: int = nb_hand - knowledge["opponent_hand"].bit_count()
+    nb_deck: int = len(remaining) + len(draw_deck) - nb_unknown - nb_private
+    games: np.ndarray = np.arange(size)[:, None]
+
+    # Remaining cards in a random order, the opponent takes the first ones in this order but
+    # a single card of each max one suit, the next cards of the suit go to the draw deck
+    cards: np.ndarray = remaining[np.argsort(rng.random((size, len(remaining))), axis=1)]
+    picked: np.ndarray
+    to_deck: np.ndarray
+    if knowledge["remaining"] & knowledge["max_one"]:
+        constrained: np.ndarray = _mask_to_bools(knowledge["max_one"])[cards]
+        suits: np.ndarray = _SUIT_INDEXES[cards]
+        seconds: np.ndarray = np.zeros(cards.shape, dtype=bool)
+        firsts: List[np.ndarray] = []
+        for suit in range(len(SUIT_MASKS)):
+            in_suit: np.ndarray = constrained & (suits == suit)
+            rank: np.ndarray = np.cumsum(in_suit, axis=1)
+            seconds |= in_suit & (rank > 1)
+            firsts.append(in_suit & (rank == 1))
+        picked = ~seconds & (np.cumsum(~seconds, axis=1) <= nb_unknown)
+        to_deck = np.zeros(cards.shape, dtype=bool)
+        for suit, first in enumerate(firsts):
+            to_deck |= seconds & (suits == suit) & (picked & first).any(axis=1)[:, None]
+    else:
+        picked = np.zeros(cards.shape, dtype=bool)
+        picked[:, :nb_unknown] = True
+        to_deck = np.zeros(cards.shape, dtype=bool)
+    others: np.ndarray = ~picked & ~to_deck
+    private: np.ndarray = others & (np.cumsum(others, axis=1) <= nb_private)
+    hands[games, cards] |= picked
+    private_discards: np.ndarray = np.zeros((size, NB_CARDS), dtype=bool)
+    private_discards[games, cards] = private
+
+    # Draw decks in a random order, the private discards missing (cards of a suit the
+    # opponent lacks may also have been discarded before) are the cards after them
+    deck_cards: np.ndarray = np.concatenate((np.repeat(draw_deck[None], size, axis=0), cards),
+                                            axis=1)
+    keys: np.ndarray = rng.random(deck_cards.shape)
+    keys[:, len(draw_deck):][picked | private] = 2
+    deck_cards = np.take_along_axis(deck_cards, np.argsort(keys, axis=1), axis=1)
+    missing: np.ndarray = nb_private - private.sum(axis=1)
+    positions: np.ndarray = np.arange(deck_cards.shape[1])[None]
+    private_discards[games, deck_cards] |= ((positions >= nb_deck)
+                                            & (positions < nb_deck + missing[:, None]))
+    decks: np.ndarray = np.full((size, DECK_SIZE), NO_CARD, dtype=np.int8)
+    decks[:, :nb_deck] = deck_cards[:, :nb_deck]
+    return hands, private_discards, decks
+
+def sample_hidden_masks(knowledge: Knowledge, nb_hand: int, nb_private: int, size: int,
+                        rng: np.random.Generator
+                        ) -> Tuple[List[Mask], List[Mask], List[List[CardInt]]]:
+    """Returns size random determinizations as for sample_hidden_cards(), as lists of card
+    masks of the opponent hands and private discards and lists of compact cards of the
+    draw decks, ready for compact states"""
+    hands, private_discards, decks = sample_hidden_cards(knowledge, nb_hand, nb_private, size,
+                                                         rng)
+    nb_deck: int = int((decks[0] != NO_CARD).sum()) if size else 0
+    return ((hands @ _BITS).tolist(), (private_discards @ _BITS).tolist(),
+            decks[:, :nb_deck].tolist())
+
+def determinize_batch(cstate: CompactState, knowledge: Knowledge, size: int,
+                      rng: np.random.Generator) -> Batch:
+    """Returns a batch of size copies of the compact state of the player of the knowledge,
+    with random determinizations of the hidden cards"""
+    opponent: int = 1 - knowledge["player"]
+    batch: Batch = repeat_batch(cstate, size)
+    (batch["hands"][:, opponent], batch["private_discards"][:, opponent],
+     batch["draw_deck"]) = sample_hidden_cards(
+        knowledge, cstate["hands"][opponent].bit_count(),
+        cstate["private_discards"][opponent].bit_count(), size, rng)
+    return batch
@@ -0,0 +1,769 @@
+"""Implementation of Fox in the Forest, a trick-taking game for two players
+designed by Joshua Buergel
+
+The game state is fully described as:
+    a dict with the following keys:
+        plays: list of plays so far
+        first_player: starting player
+        init_draw_deck: starting draw deck (6 cards)
+        init_trump_card: starting trump card
+        init_hands: a list of the two starting hands
+
+Inside the engine, a second, compact representation is available for fast searches:
+    cards are small ints (index of the card in CARDS, 0 to 32),
+    sets of cards (hands, discards) are 33-bit masks,
+    plays are ints (player << 6 | card)
+"""
+from __future__ import annotations
+from typing import List, Dict, Tuple, Union, Any
+import random
+import json
+from array import array
+from copy import copy
+
+Card = List[Union[int, str, None]]
+Play = List[Union[int, Card]]
+State = Dict[str, Any]
+Game = Dict[str, Any]
+CardInt = int
+Mask = int
+CompactState = Dict[str, Any]
+Undo = Tuple[Any, ...]
+
+COLORS: List[str] = ["h", "s", "c"]
+CARDS: List[Card] = [[a, b] for b in COLORS for a in range(1, 12)]
+
+NB_CARDS: int = len(CARDS)
+NO_CARD: CardInt = -1
+"""Compact value of an empty trick slot or of the trump card while it is exchanged"""
+CARD_VALUES: List[int] = [card[0] for card in CARDS]
+CARD_SUITS: List[int] = [COLORS.index(card[1]) for card in CARDS]
+SUIT_MASKS: List[Mask] = [sum(1 << n for n in range(NB_CARDS) if CARD_SUITS[n] == suit)
+                          for suit in range(len(COLORS))]
+FOLLOW_MASKS: List[Mask] = [SUIT_MASKS[CARD_SUITS[n]] for n in range(NB_CARDS)]
+"""Mask of the cards that follow the suit of each card"""
+ONE_MASKS: List[Mask] = [1 << (CARD_SUITS[n] * 11) for n in range(NB_CARDS)]
+"""Mask of the 1 of the suit of each card"""
+SEVENS_MASK: Mask = sum(1 << n for n in range(NB_CARDS) if CARD_VALUES[n] == 7)
+TRICK_POINTS: List[int] = [6, 6, 6, 6, 1, 2, 3, 6, 6, 6, 0, 0, 0, 0]
+"""Points scored depending on the number of tricks won (humble, defeated, victorious, greedy)"""
+DECK_SIZE: int = 6
+"""Number of cards in the draw deck at the start of a game"""
+ZOBRIST_SEED: int = 20211104
+"""Seed of the random keys of zobrist_hash()"""
+GAME_FORMAT_VERSION: int = 1
+"""Version of the binary format of encode_game()"""
+_CARD_INDEX: Dict[Tuple[Any, Any], CardInt] = {(card[0], card[1]): n
+                                               for n, card in enumerate(CARDS)}
+
+def other_player(player: int) -> int:
+    """Returns the opponent number"""
+    return 1 - player
+
+def pick_cards(deck: List[Card], num: int) -> List[Card]:
+    """Return a number of cards from the top of the given list of cards"""
+    cards: List[Card] = deck[:num]
+    del deck[:num]
+    return cards
+
+def new_game() -> Game:
+    """Create a new game"""
+    draw_deck: List[Card] = copy(CARDS)
+    random.shuffle(draw_deck)
+    hands: List[List[Card]] = []
+    for _ in range(2):
+        hands.append(pick_cards(draw_deck, 13))
+    trump_card: Card = pick_cards(draw_deck, 1)[0]
+    first_player: int = random.randint(0, 1)
+    return {
+        "plays": [],
+        "first_player": first_player,
+        "init_draw_deck": draw_deck,
+        "init_trump_card": trump_card,
+        "init_hands": hands
+    }
+
+def copy_game(game: Game) -> Game:
+    """Output a cloned copy of the given game """
+    return {
+        "plays": game["plays"].copy(),
+        "first_player": game["first_player"],
+        "init_draw_deck": game["init_draw_deck"].copy(),
+        "init_trump_card": game["init_trump_card"],
+        "init_hands": [game["init_hands"][0].copy(), game["init_hands"][1].copy()]
+    }
+
+def encode_game(game: Game) -> bytes:
+    """Returns the compact binary encoding of a fully known game
+        byte 0: format version (GAME_FORMAT_VERSION)
+        byte 1: first player
+        bytes 2 to 34: compact ints of the cards of the deal
+            (first hand, second hand, trump card, draw deck)
+        following bytes: compact ints of the plays, one byte each"""
+    deal: List[Card] = (game["init_hands"][0] + game["init_hands"][1]
+                        + [game["init_trump_card"]] + game["init_draw_deck"])
+    return bytes([GAME_FORMAT_VERSION, game["first_player"]]
+                 + [card_to_int(card) for card in deal]
+                 + [play_to_int(step) for step in game["plays"]])
+
+def decode_game(data: Union[bytes, str]) -> Game:
+    """Returns the game described by encode_game() output
+        games stored before the binary format (json dump of the game) are also accepted"""
+    if isinstance(data, str):
+        return json.loads(data)
+    data = bytes(data)
+    if data[:1] == b"{":
+        return json.loads(data)
+    if data[0] != GAME_FORMAT_VERSION:
+        raise ValueError(f"Unknown game format version {data[0]}")
+    deal: List[Card] = [int_to_card(card) for card in data[2:2 + NB_CARDS]]
+    return {
+        "plays": [int_to_play(step) for step in data[2 + NB_CARDS:]],
+        "first_player": data[1],
+        "init_draw_deck": deal[27:],
+        "init_trump_card": deal[26],
+        "init_hands": [deal[:13], deal[13:26]]
+    }
+
+def copy_state(state: State) -> State:
+    """Output a cloned copy of the given state """
+    return {
+        "plays": state["plays"].copy(),
+        "private_discards": [state["private_discards"][0].copy(),
+                             state["private_discards"][1].copy()],
+        "trick": [state["trick"][0],state["trick"][1]],
+        "current_player": state["current_player"],
+        "leading_player": state["leading_player"],
+        "score": [state["score"][0], state["score"][1]],
+        "discards": [state["discards"][0].copy(), state["discards"][1].copy()],
+        "hands": [state["hands"][0].copy(), state["hands"][1].copy()],
+        "init_trump_card": state["init_trump_card"],
+        "trump_card": state["trump_card"],
+        "draw_deck": state["draw_deck"].copy()
+    }
+
+def get_state_from_game(game: Game) -> State:
+    """Returns the current status of a game state
+        a state is a dict with the following keys:
+            plays: list of plays so far
+            private_discards: list of cards secretely discarded by each player
+            trick: list of cards of the current trick played
+            current_player: next player to play
+            leading_player: player leading the current trick
+            score: score ([0, 0] if the game is not yet finished)
+            discards: list of cards won by each player
+            hands: a list of the two hands
+            init_trump_card: starting trump card, necessary to know to have
+                a full knowledge of a game
+            trump_card: current trump card
+            draw_deck: cards remaining in the draw deck"""
+    return _replay_game(game)[0]
+
+def _replay_game(game: Game) -> Tuple[State, Union[int, None]]:
+    """Returns the current State of a game and its pending special play"""
+    state: State = {}
+    state["plays"] = []
+    state["private_discards"] = [[], []]
+    state["trick"] = [None, None]
+    state["current_player"] = game["first_player"]
+    state["leading_player"] = game["first_player"]
+    state["score"] = [0, 0]
+    state["discards"] = [[], []]
+    state["hands"] = [game["init_hands"][0].copy(), game["init_hands"][1].copy()]
+    state["init_trump_card"] = game["init_trump_card"]
+    state["trump_card"] = game["init_trump_card"]
+    state["draw_deck"] = game["init_draw_deck"].copy()
+    special_type: Union[int, None] = None
+    for step in game["plays"]:
+        state, special_type = do_step(state, step, special_type)
+    if len(state["hands"][0]) + len(state["hands"][1]) == 0:
+        state["score"] = get_score(state)
+    return state, special_type
+
+class GameState():
+    """Keeps a Game together with its current State, so that plays are applied
+    one at a time instead of replaying the whole game on each access
+    Args:
+        game (Game): the game to follow, its plays are replayed once
+
+    Attributes:
+        game (Game): the game, updated by each play
+        state (State): the current state of the game
+        special_type: pending special play (3 or 5) or None
+    """
+
+    def __init__(self, game: Game) -> None:
+        self.game: Game = game
+        self.state: State
+        self.special_type: Union[int, None]
+        self.state, self.special_type = _replay_game(game)
+
+    def apply_play(self, step: Play) -> None:
+        """Blindly apply a play to the game and its state
+            Warning: the validity of the play is not checked, use play() if check is necessary
+        """
+        self.game["plays"].append(step)
+        self.state, self.special_type = do_step(self.state, step, self.special_type)
+        if len(self.state["hands"][0]) + len(self.state["hands"][1]) == 0:
+            self.state["score"] = get_score(self.state)
+
+    def play(self, step: Play) -> bool:
+        """Apply a play if it is valid, returns whether it was applied"""
+        if not valid_step(self.state, step):
+            return False
+        self.apply_play(step)
+        return True
+
+    def is_finished(self) -> bool:
+        """Checks if all tricks have been played"""
+        return len(self.state["discards"][0]) + len(self.state["discards"][1]) == 26
+
+def do_step(state: State, step: Play,
+            special_type: Union[int, None]) -> Tuple[State, Union[int, None]]:
+    """Apply a play to a State and returns the next State"""
+    state["plays"].append(step)
+    if special_type is None:
+        state["trick"][step[0]] = step[1]
+        if step[1] in state["hands"][step[0]]:
+            state["hands"][step[0]].remove(step[1])
+        else:
+            state["hands"][step[0]].pop(0)
+        if step[1][0] == 3:
+            special_type = 3
+            state["hands"][step[0]].append(state["trump_card"])
+            state["trump_card"] = []
+        elif step[1][0] == 5:
+            special_type = 5
+            state["hands"][step[0]].append(pick_cards(state["draw_deck"], 1)[0])
+    elif special_type == 5:
+        state["private_discards"][step[0]].append(step[1])
+        if step[1] in state["hands"][step[0]]:
+            state["hands"][step[0]].remove(step[1])
+        else:
+            state["hands"][step[0]].pop(0)
+        special_type = None
+    elif special_type == 3:
+        state["trump_card"] = step[1]
+        if step[1] in state["hands"][step[0]]:
+            state["hands"][step[0]].remove(step[1])
+        else:
+            state["hands"][step[0]].pop(0)
+        special_type = None
+    if special_type is None:
+        if not None in state["trick"]:
+            win, state["leading_player"] = trick_winner(state["leading_player"],
+                                                        state["trick"], state["trump_card"])
+            state["discards"][win].append(state["trick"][0])
+            state["discards"][win].append(state["trick"][1])
+            state["trick"] = [None, None]
+            state["current_player"] = state["leading_player"]
+        else:
+            state["current_player"] = other_player(step[0])
+    return state, special_type
+
+def get_player_game(game: Game, player: int) -> Game:
+    """Returns a Game state stripped-off information that is not known by the player"""
+    return PlayerGame(game, player).game
+
+class PlayerGame():
+    """View of a Game by one player, stripped-off information that is not known by the player,
+    kept up to date as plays are appended to the game (see get_player_game())
+    Args:
+        game (Game): the complete game
+        player (int): the player viewing the game
+
+    Attributes:
+        player (int): the player viewing the game
+        game (Game): the view of the game by the player, with an additional "player" key
+    """
+
+    def __init__(self, game: Game, player: int) -> None:
+        hands: List[List[Card]] = [[], []]
+        hands[player] = game["init_hands"][player].copy()
+        hands[other_player(player)] = [[None, None]] * len(game["init_hands"][other_player(player)])
+        self.player: int = player
+        self.game: Game = {
+            "player": player,
+            "plays": [],
+            "first_player": game["first_player"],
+            "init_draw_deck": [[None, None]] * len(game["init_draw_deck"]),
+            "init_trump_card": game["init_trump_card"],
+            "init_hands": hands
+        }
+        self._picked: int = 0
+        self._next_special: bool = False
+        self._hide_next: bool = False
+        self.update(game)
+
+    def update(self, game: Game) -> Game:
+        """Add to the view the plays of the game it does not have yet and returns the view
+            the game must be the one the view was created from, with plays appended since"""
+        for step in game["plays"][len(self.game["plays"]):]:
+            if self._hide_next:
+                self.game["plays"].append([step[0], [None, None]])
+            else:
+                self.game["plays"].append(step)
+            if step[1][0] == 5 and not self._next_special:
+                self._next_special = True
+                if step[0] == self.player:
+                    self.game["init_draw_deck"][self._picked] = game["init_draw_deck"][self._picked]
+                else:
+                    self._hide_next = True
+                self._picked += 1
+            elif step[1][0] == 3 and not self._next_special:
+                self._next_special = True
+            elif self._next_special:
+                self._next_special = False
+                self._hide_next = False
+        return self.game
+
+def play(game: Game, step: Play) -> Game:
+    """Apply a play to a Game and returns the next Game"""
+    state: State = get_state_from_game(game)
+    if valid_step(state, step):
+        game = apply_play(game, step)
+    return game
+
+def apply_play(game: Game, step: Play) -> Game:
+    """Blindly apply a play to a Game and returns the next Game
+        Warning: can return an invalid game state
+            the validity of the play is not checked, use play() if check is necessary
+    """
+    game["plays"].append(step)
+    return game
+
+def trick_winner(leading_player: int, trick: List[Card],
+                 trump_card: Card) -> Tuple[int, int]:
+    """Returns the winner of a trick as well as the next leading player"""
+    winner: int
+    next_leading_player: int
+    trump_suit: str = trump_card[1]
+    card0_suit: str = trick[0][1]
+    card0_value: int = trick[0][0]
+    card1_suit: str = trick[1][1]
+    card1_value: int = trick[1][0]
+
+    # 9 change suit if not paired with an other 9
+    if card0_value == 9:
+        if card1_value != 9:
+            card0_suit = trump_suit
+    if card1_value == 9:
+        if card0_value != 9:
+            card1_suit = trump_suit
+
+    if card0_suit == card1_suit: # Same suit
+        if card0_value > card1_value:
+            winner = 0
+        else:
+            winner = 1
+    else: # different suit
+        if card0_suit == trump_suit:
+            winner = 0
+        elif card1_suit == trump_suit:
+            winner = 1
+        else:
+            winner = leading_player
+    if winner == 0:
+        if card1_value == 1:
+            next_leading_player = 1
+        else:
+            next_leading_player = 0
+    else:
+        if card0_value == 1:
+            next_leading_player = 0
+        else:
+            next_leading_player = 1
+    return (winner, next_leading_player)
+
+def valid_step(state: State, step: Play) -> bool:
+    """Check if a play is valid, i.e. if it is one of the allowed plays"""
+    return step[0] == state["current_player"] and step[1] in _allowed_cards(state, step[0])
+
+def get_score(state: State) -> List[int]:
+    """Get the score of a finished game"""
+    score: List[int] = [0, 0]
+    for player in range(2):
+        for card in state["discards"][player]:
+            if card[0] == 7:
+                score[player] += 1
+
+    tricks_won: List[int] = [len(state["discards"][0])//2, len(state["discards"][1])//2]
+
+    if tricks_won[0] + tricks_won[1] == 13:
+        for player in range(2):
+            score[player] += TRICK_POINTS[tricks_won[player]]
+    return score
+
+def decode_card(card_text: str) -> Union[Card, bool]:
+    """Return a card object using a text input"""
+    try:
+        return [int(card_text[:-1]), card_text[-1]]
+    except ValueError:
+        return False
+
+def show(state: State, player: int) -> None:
+    """Print the state of the game in the console"""
+    if state["current_player"] == player:
+        print("------------")
+        print(f'Joueur {state["current_player"]}')
+        if state["trump_card"]:
+            print(f'[**] [{state["trump_card"][0]}{state["trump_card"][1]}]')
+        else:
+            print("[**] [xx]")
+        print("Pli : J0 {} / J1 {}".format(*["[{}{}]".format(c[0], c[1])
+            if c is not None else "[xx]" for c in [state["trick"][0], state["trick"][1]]]))
+        print(" ".join(["[{}{}]".format(c[0], c[1])
+            for c in sorted(state["hands"][player], key = lambda a: (a[1], a[0]), reverse = True)]))
+
+def list_allowed(state: State, player: int) -> List[Play]:
+    """Returns a list of allowed plays for the given player."""
+    if state["current_player"] != player:
+        return []
+    return [[player, card] for card in _allowed_cards(state, player)]
+
+def _allowed_cards(state: State, player: int) -> List[Card]:
+    """Returns the cards of the hand of the player to play that can be played, the rules of
+    list_allowed() and valid_step()"""
+    hand: List[Card] = state["hands"][player]
+    other_card: Union[Card, None] = _card_to_follow(state, player)
+    if other_card is not None:
+        same_suit: List[Card] = [card for card in hand if card[1] == other_card[1]]
+        if same_suit: # Otherwise any card
+            if other_card[0] == 11: # Force best card or 1
+                best: int = max(card[0] for card in same_suit)
+                return [card for card in same_suit if card[0] in (1, best)]
+            return same_suit
+    return [card for card in hand if card[0] is not None]
+
+def _card_to_follow(state: State, player: int) -> Union[Card, None]:
+    """Returns the card the player has to follow
+        None if the player leads or plays the second part of a 3 or a 5"""
+    if state["trick"][player] is not None:
+        return None
+    return state["trick"][other_player(player)]
+
+def legal_cards(hand: Mask, other_card: CardInt) -> Mask:
+    """Returns the mask of the cards of a hand that can be played after other_card
+        other_card is NO_CARD when the player leads or plays the second part of a 3 or a 5"""
+    if other_card == NO_CARD:
+        return hand
+    same_suit: Mask = hand & FOLLOW_MASKS[other_card]
+    if not same_suit: # No card of the same suit: any card
+        return hand
+    if CARD_VALUES[other_card] == 11: # Force best card or 1
+        return (same_suit & ONE_MASKS[other_card]) | (1 << (same_suit.bit_length() - 1))
+    return same_suit
+
+def card_to_int(card: Card) -> CardInt:
+    """Returns the compact int of a card"""
+    return _CARD_INDEX[(card[0], card[1])]
+
+def int_to_card(card: CardInt) -> Card:
+    """Returns the card described by a compact int"""
+    return [CARD_VALUES[card], COLORS[CARD_SUITS[card]]]
+
+def play_to_int(step: Play) -> int:
+    """Returns the compact int of a play"""
+    return step[0] << 6 | card_to_int(step[1])
+
+def int_to_play(step: int) -> Play:
+    """Returns the play described by a compact int"""
+    return [step >> 6, int_to_card(step & 63)]
+
+def cards_to_mask(cards: List[Card]) -> Mask:
+    """Returns the mask of a list of cards, hidden cards ([None, None]) are ignored"""
+    mask: Mask = 0
+    for card in cards:
+        if card[0] is not None:
+            mask |= 1 << card_to_int(card)
+    return mask
+
+def mask_to_ints(mask: Mask) -> List[CardInt]:
+    """Returns the compact ints of the cards of a mask, in increasing order"""
+    return (SUIT_CARDS[0][mask & SUIT_MASKS[0]] + SUIT_CARDS[1][mask >> 11 & SUIT_MASKS[0]]
+            + SUIT_CARDS[2][mask >> 22])
+
+def mask_to_cards(mask: Mask) -> List[Card]:
+    """Returns the list of cards of a mask, in the CARDS order"""
+    return [int_to_card(card) for card in mask_to_ints(mask)]
+
+def compact_state(state: State, special_type: Union[int, None] = None) -> CompactState:
+    """Returns the compact form of a fully known State
+        a compact state is a dict with the following keys:
+            private_discards: mask of the cards secretely discarded by each player
+            trick: compact int of the cards of the current trick (NO_CARD if not played)
+            current_player: next player to play
+            leading_player: player leading the current trick
+            discards: mask of the cards won by each player
+            hands: mask of the cards of each hand
+            trump_card: compact int of the current trump card
+            draw_deck: array of compact ints of the cards remaining in the draw deck
+            special_type: pending special play (3 or 5) or None
+        its Zobrist hash (see zobrist_hash()) is only kept, in a "hash" key, by
+        compact_make_step()"""
+    cstate: CompactState = {
+        "private_discards": [cards_to_mask(state["private_discards"][0]),
+                             cards_to_mask(state["private_discards"][1])],
+        "trick": [NO_CARD if card is None else card_to_int(card) for card in state["trick"]],
+        "current_player": state["current_player"],
+        "leading_player": state["leading_player"],
+        "discards": [cards_to_mask(state["discards"][0]), cards_to_mask(state["discards"][1])],
+        "hands": [cards_to_mask(state["hands"][0]), cards_to_mask(state["hands"][1])],
+        "trump_card": card_to_int(state["trump_card"]) if state["trump_card"] else NO_CARD,
+        "draw_deck": array('b', [card_to_int(card) for card in state["draw_deck"]]),
+        "special_type": special_type
+    }
+    return cstate
+
+def copy_compact_state(cstate: CompactState) -> CompactState:
+    """Output a cloned copy of the given compact state"""
+    return {
+        "private_discards": [cstate["private_discards"][0], cstate["private_discards"][1]],
+        "trick": [cstate["trick"][0], cstate["trick"][1]],
+        "current_player": cstate["current_player"],
+        "leading_player": cstate["leading_player"],
+        "discards": [cstate["discards"][0], cstate["discards"][1]],
+        "hands": [cstate["hands"][0], cstate["hands"][1]],
+        "trump_card": cstate["trump_card"],
+        "draw_deck": array('b', cstate["draw_deck"]),
+        "special_type": cstate["special_type"]
+    }
+
+def zobrist_hash(cstate: CompactState) -> int:
+    """Returns the Zobrist hash of a compact state, computed from scratch
+        it covers hands, trick, trump card, leading and current players, pending special,
+        draw deck and, for the cards won, what matters for the score (tricks and 7s)
+        private discards are not part of it"""
+    value: int = 0
+    for player in range(2):
+        for card in mask_to_ints(cstate["hands"][player]):
+            value ^= HAND_KEYS[player][card]
+        if cstate["trick"][player] != NO_CARD:
+            value ^= TRICK_KEYS[player][cstate["trick"][player]]
+        value ^= WON_KEYS[player][_won_index(cstate["discards"][player])]
+    if cstate["trump_card"] != NO_CARD:
+        value ^= TRUMP_KEYS[cstate["trump_card"]]
+    value ^= LEADER_KEYS[cstate["leading_player"]] ^ CURRENT_KEYS[cstate["current_player"]]
+    value ^= SPECIAL_KEYS[cstate["special_type"]]
+    drawn: int = DECK_SIZE - len(cstate["draw_deck"])
+    for position, card in enumerate(cstate["draw_deck"]):
+        value ^= DECK_KEYS[drawn + position][card]
+    return value
+
+def _won_index(discards: Mask) -> int:
+    """Returns the index in WON_KEYS of the cards won by a player"""
+    return discards.bit_count() // 2 * 4 + (discards & SEVENS_MASK).bit_count()
+
+def compact_trick_winner(leading_player: int, card0: CardInt, card1: CardInt,
+                         trump_card: CardInt) -> Tuple[int, int]:
+    """Returns the winner of a trick as well as the next leading player (compact cards)"""
+    return TRICK_WINNERS[((leading_player * 3 + CARD_SUITS[trump_card]) * NB_CARDS + card0)
+                         * NB_CARDS + card1]
+
+def _build_trick_winners() -> List[Tuple[int, int]]:
+    """Returns the trick_winner() result for every leading player, trump suit and trick
+        indexed by ((leading_player * 3 + trump_suit) * NB_CARDS + card0) * NB_CARDS + card1"""
+    table: List[Tuple[int, int]] = []
+    for leading_player in range(2):
+        for trump_suit in COLORS:
+            for card0 in CARDS:
+                for card1 in CARDS:
+                    table.append(trick_winner(leading_player, [card0, card1], [1, trump_suit]))
+    return table
+
+def compact_do_step(cstate: CompactState, step: int) -> None:
+    """Apply a compact play to a compact state, in place
+        see compact_make_step() to be able to undo the play and to keep the Zobrist hash"""
+    player: int = step >> 6
+    card: CardInt = step & 63
+    hands: List[Mask] = cstate["hands"]
+    trick: List[CardInt] = cstate["trick"]
+    special_type: Union[int, None] = cstate["special_type"]
+    hands[player] &= ~(1 << card)
+    if special_type is None:
+        trick[player] = card
+        if CARD_VALUES[card] == 3:
+            cstate["special_type"] = 3
+            hands[player] |= 1 << cstate["trump_card"]
+            cstate["trump_card"] = NO_CARD
+            return
+        if CARD_VALUES[card] == 5:
+            cstate["special_type"] = 5
+            hands[player] |= 1 << cstate["draw_deck"].pop(0)
+            return
+    elif special_type == 5:
+        cstate["private_discards"][player] |= 1 << card
+        cstate["special_type"] = None
+    else:
+        cstate["trump_card"] = card
+        cstate["special_type"] = None
+    if trick[0] != NO_CARD and trick[1] != NO_CARD:
+        win, leading_player = TRICK_WINNERS[
+            ((cstate["leading_player"] * 3 + CARD_SUITS[cstate["trump_card"]]) * NB_CARDS
+             + trick[0]) * NB_CARDS + trick[1]]
+        cstate["discards"][win] |= 1 << trick[0] | 1 << trick[1]
+        trick[0] = NO_CARD
+        trick[1] = NO_CARD
+        cstate["leading_player"] = leading_player
+        cstate["current_player"] = leading_player
+    else:
+        cstate["current_player"] = other_player(player)
+
+def compact_make_step(cstate: CompactState, step: int) -> Undo:
+    """Apply a compact play to a compact state, in place, like compact_do_step(), and update
+    its Zobrist hash (cstate["hash"], see zobrist_hash())
+        Returns an undo record, to give to compact_undo_step() to restore the previous state"""
+    player: int = step >> 6
+    card: CardInt = step & 63
+    hands: List[Mask] = cstate["hands"]
+    trick: List[CardInt] = cstate["trick"]
+    discards: List[Mask] = cstate["discards"]
+    special_type: Union[int, None] = cstate["special_type"]
+    trump_card: CardInt = cstate["trump_card"]
+    value: int = cstate["hash"]
+    undo: Undo = (step, hands[player], trick[0], trick[1], cstate["current_player"],
+                  cstate["leading_player"], discards[0], discards[1],
+                  cstate["private_discards"][player], trump_card, special_type, value,
+                  NO_CARD)
+    hands[player] &= ~(1 << card)
+    value ^= HAND_KEYS[player][card] ^ SPECIAL_KEYS[special_type]
+    if special_type is None:
+        trick[player] = card
+        value ^= TRICK_KEYS[player][card]
+        if CARD_VALUES[card] == 3:
+            special_type = 3
+            hands[player] |= 1 << trump_card
+            value ^= HAND_KEYS[player][trump_card] ^ TRUMP_KEYS[trump_card]
+            cstate["trump_card"] = NO_CARD
+        elif CARD_VALUES[card] == 5:
+            special_type = 5
+            value ^= DECK_KEYS[DECK_SIZE - len(cstate["draw_deck"])][cstate["draw_deck"][0]]
+            drawn: CardInt = cstate["draw_deck"].pop(0)
+            hands[player] |= 1 << drawn
+            value ^= HAND_KEYS[player][drawn]
+            undo = undo[:-1] + (drawn,)
+    elif special_type == 5:
+        cstate["private_discards"][player] |= 1 << card
+        special_type = None
+    else:
+        cstate["trump_card"] = card
+        value ^= TRUMP_KEYS[card]
+        special_type = None
+    cstate["special_type"] = special_type
+    value ^= SPECIAL_KEYS[special_type]
+    if special_type is None:
+        if trick[0] != NO_CARD and trick[1] != NO_CARD:
+            leading_player: int = cstate["leading_player"]
+            win, cstate["leading_player"] = TRICK_WINNERS[
+                ((leading_player * 3 + CARD_SUITS[cstate["trump_card"]]) * NB_CARDS
+                 + trick[0]) * NB_CARDS + trick[1]]
+            value ^= (TRICK_KEYS[0][trick[0]] ^ TRICK_KEYS[1][trick[1]]
+                      ^ WON_KEYS[win][_won_index(discards[win])]
+                      ^ LEADER_KEYS[leading_player] ^ LEADER_KEYS[cstate["leading_player"]]
+                      ^ CURRENT_KEYS[player] ^ CURRENT_KEYS[cstate["leading_player"]])
+            discards[win] |= 1 << trick[0] | 1 << trick[1]
+            value ^= WON_KEYS[win][_won_index(discards[win])]
+            trick[0] = NO_CARD
+            trick[1] = NO_CARD
+            cstate["current_player"] = cstate["leading_player"]
+        else:
+            cstate["current_player"] = other_player(player)
+            value ^= CURRENT_KEYS[player] ^ CURRENT_KEYS[other_player(player)]
+    cstate["hash"] = value
+    return undo
+
+def compact_undo_step(cstate: CompactState, undo: Undo) -> None:
+    """Restore, in place, the compact state as it was before the play of the undo record"""
+    (step, hand, trick0, trick1, current_player, leading_player, discards0, discards1,
+     private_discards, trump_card, special_type, value, drawn) = undo
+    player: int = step >> 6
+    cstate["hands"][player] = hand
+    cstate["trick"][0] = trick0
+    cstate["trick"][1] = trick1
+    cstate["current_player"] = current_player
+    cstate["leading_player"] = leading_player
+    cstate["discards"][0] = discards0
+    cstate["discards"][1] = discards1
+    cstate["private_discards"][player] = private_discards
+    cstate["trump_card"] = trump_card
+    cstate["special_type"] = special_type
+    cstate["hash"] = value
+    if drawn != NO_CARD:
+        cstate["draw_deck"].insert(0, drawn)
+
+def compact_list_allowed(cstate: CompactState) -> List[int]:
+    """Returns the list of compact plays allowed for the current player"""
+    player: int = cstate["current_player"]
+    other_card: CardInt = NO_CARD
+    if cstate["special_type"] is None:
+        other_card = cstate["trick"][other_player(player)]
+    legal: Mask = legal_cards(cstate["hands"][player], other_card)
+    plays: List[List[List[int]]] = SUIT_PLAYS[player]
+    return (plays[0][legal & SUIT_MASKS[0]] + plays[1][legal >> 11 & SUIT_MASKS[0]]
+            + plays[2][legal >> 22])
+
+def compact_get_score(cstate: CompactState) -> List[int]:
+    """Get the score of a finished compact state"""
+    tricks_won: List[int] = [cstate["discards"][0].bit_count() // 2,
+                             cstate["discards"][1].bit_count() // 2]
+    score: List[int] = [(cstate["discards"][0] & SEVENS_MASK).bit_count(),
+                        (cstate["discards"][1] & SEVENS_MASK).bit_count()]
+    if tricks_won[0] + tricks_won[1] == 13:
+        score[0] += TRICK_POINTS[tricks_won[0]]
+        score[1] += TRICK_POINTS[tricks_won[1]]
+    return score
+
+_ZOBRIST_RANDOM: random.Random = random.Random(ZOBRIST_SEED)
+HAND_KEYS: List[List[int]] = [[_ZOBRIST_RANDOM.getrandbits(64) for _ in range(NB_CARDS)]
+                              for _ in range(2)]
+TRICK_KEYS: List[List[int]] = [[_ZOBRIST_RANDOM.getrandbits(64) for _ in range(NB_CARDS)]
+                               for _ in range(2)]
+TRUMP_KEYS: List[int] = [_ZOBRIST_RANDOM.getrandbits(64) for _ in range(NB_CARDS)]
+DECK_KEYS: List[List[int]] = [[_ZOBRIST_RANDOM.getrandbits(64) for _ in range(NB_CARDS)]
+                              for _ in range(DECK_SIZE)]
+WON_KEYS: List[List[int]] = [[_ZOBRIST_RANDOM.getrandbits(64) for _ in range(14 * 4)]
+                             for _ in range(2)]
+"""Keys of the cards won by each player, indexed by tricks won * 4 + 7s won"""
+LEADER_KEYS: List[int] = [_ZOBRIST_RANDOM.getrandbits(64) for _ in range(2)]
+CURRENT_KEYS: List[int] = [_ZOBRIST_RANDOM.getrandbits(64) for _ in range(2)]
+SPECIAL_KEYS: Dict[Union[int, None], int] = {None: 0, 3: _ZOBRIST_RANDOM.getrandbits(64),
+                                             5: _ZOBRIST_RANDOM.getrandbits(64)}
+
+TRICK_WINNERS: List[Tuple[int, int]] = _build_trick_winners()
+"""Precomputed (winner, next leading player) of every trick, see compact_trick_winner()"""
+
+SUIT_CARDS: List[List[List[CardInt]]] = [
+    [[suit * 11 + n for n in range(11) if chunk >> n & 1] for chunk in range(SUIT_MASKS[0] + 1)]
+    for suit in range(len(COLORS))]
+"""Compact cards of the 11 bits of a suit in a mask, by suit and bits, see mask_to_ints()"""
+SUIT_PLAYS: List[List[List[List[int]]]] = [
+    [[[player << 6 | card for card in cards] for cards in suit_cards] for suit_cards in SUIT_CARDS]
+    for player in range(2)]
+"""Compact plays of the 11 bits of a suit in a mask, by player, suit and bits"""
+
+if __name__ ==  '__main__':
+    game_test: Game = new_game()
+    print(game_test)
+    state_test: State = get_state_from_game(game_test)
+    current_player: int
+    while len(state_test["hands"][0]) != 0 or len(state_test["hands"][1]) != 0:
+        current_player = state_test["current_player"]
+        show(state_test, current_player)
+        if current_player == 0:
+            state_0 = get_state_from_game(get_player_game(game_test, 0))
+            # print(state_0)
+            # card_played = decode_card(input("Carte ? "))
+            # selected_play = [0, card_played]
+            selected_play = random.choice(list_allowed(state_0, 0))
+        else:
+            state_1 = get_state_from_game(get_player_game(game_test, 1))
+            selected_play = random.choice(list_allowed(state_1, 1))
+        print(f'Carte : {selected_play[1][0]}{selected_play[1][1]}')
+        play(game_test, selected_play)
+        state_test = get_state_from_game(game_test)
+
+    print("Résultat :")
+    print(f'Plis gagnés : P0 {len(state_test["discards"][0])//2}, '
+          f'P1 {len(state_test["discards"][1])//2}'
+    )
+    print(f'Score : P0 {get_score(state_test)[0]}, P1 {get_score(state_test)[1]}')
@@ -0,0 +1,635 @@
+"""Good AI for the Fox in the Forest game
+
+This AI uses a Monte Carlo Tree Search algorithm adapted to hidden information
+games inspired by Information Set Monte Carlo Tree Search (ISMCTS) algorithm
+found in http://www.aifactory.co.uk/newsletter/2013_01_reduce_burden.htm
+
+As there is no "standard" way of describing a game state in Fox in the Forest
+this AI is heavily reliant on foxintheforest.py implementation.
+
+Playouts follow a rollout policy of rollout.py, cheap heuristic rules by default, or
+each leaf is evaluated by a batch of random playouts on the NumPy engine of batch.py
+(leaf parallelization).
+
+With several workers, independent searches are run on a pool of processes and
+their root statistics are merged (root parallelization).
+
+Point of entry is ai_play(game), the rest of methodes are private
+"""
+from __future__ import annotations
+
+from typing import List, Dict, Tuple, Union, Any, Callable, Hashable, Set
+from array import array
+from collections import OrderedDict
+from random import shuffle, seed, getrandbits
+from math import sqrt, log, exp
+from multiprocessing.pool import Pool
+import atexit
+
+import numpy as np
+
+from foxy.engine.foxintheforest import (
+    copy_state, other_player, get_state_from_game, list_allowed, Card, CardInt, Play, State,
+    Game, Mask, NB_CARDS, NO_CARD, CARD_SUITS, CARD_VALUES, SUIT_MASKS, FOLLOW_MASKS,
+    CompactState, cards_to_mask, card_to_int, int_to_card, mask_to_ints, mask_to_cards,
+    compact_state,
+    copy_compact_state, compact_do_step, compact_list_allowed, compact_get_score, int_to_play,
+    play_to_int
+)
+from foxy.engine.batch import Batch, repeat_batch, batch_random_playout, batch_get_score
+from foxy.engine.decision_cache import DecisionCache, information_set_key
+from foxy.engine.determinization import sample_hidden_masks
+from foxy.engine.opening_book import OpeningBook
+from foxy.engine.rollout import POLICIES, Policy
+from foxy.engine.solver import solve
+from foxy.engine.symmetry import (
+    Permutation, IDENTITY, canonical_permutation, inverse_permutation, permute_compact_play
+)
+from foxy.engine.transposition import TranspositionTable
+from foxy.engine.tree import Tree, ROOT, NO_NODE
+
+from time import time
+
+Knowledge = Dict[str, Any]
+RootStatistics = Dict[int, Tuple[int, float]]
+SearchArguments = Tuple[Game, Union[Knowledge, None], Union[float, None], Union[int, None], float,
+                        str, int, int]
+
+K: float = 1.4
+"""Parameter of the Upper Confidence Bound formula"""
+
+TURN_DURATION: Union[float, None] = 5
+"""Maximum time to think on each turn (seconds, None: only limited by NB_SIMUL_P0)"""
+
+NB_SIMUL_P0: Union[int, None] = None
+"""Maximum number of simulated games on each turn (None: only limited by TURN_DURATION)"""
+
+CHECK_INTERVAL: int = 32
+"""Number of simulated games between two checks of the time and of early stopping"""
+
+NB_WORKERS: int = 1
+"""Number of processes searching in parallel on each turn (1: search in the calling process)"""
+
+ROLLOUT_POLICY: str = "heuristic"
+"""Name of the rollout policy of the playouts (see rollout.POLICIES)"""
+
+LEAF_PLAYOUTS: int = 1
+"""Number of playouts evaluating each leaf, on the batch engine if more than 1 (the rollout
+policy is then uniformly random)"""
+
+PONDER_DURATION: Union[float, None] = 60
+"""Maximum time to think during the opponent's turn (seconds, None: no pondering)"""
+
+DETERMINIZATIONS: int = 256
+"""Number of random determinizations of the hidden cards sampled at once by the search"""
+
+EXPANSION_THRESHOLD: int = 1
+"""Number of visits (and thus simulations) before expanding the node"""
+
+ENDGAME_CARDS: int = 3
+"""Number of cards left in both hands from which random playouts are replaced by
+the exact result of the endgame solver (0 to never solve), higher values spend most of
+the search time in the solver for no gain at equal time"""
+
+endgame_table: TranspositionTable = TranspositionTable()
+"""Transposition table of the endgame solver, shared by successive decisions"""
+
+pools: Dict[int, Pool] = {}
+"""Pools of worker processes of the parallel search, by number of workers, kept between
+turns and closed at exit"""
+
+MAX_TREES: int = 16
+"""Number of matches whose search trees and knowledges are kept between turns (least recently
+used ones are dropped)"""
+
+MAX_KEPT_NODES: int = 2 ** 19
+"""Total number of nodes of the search trees kept between turns, least recently used trees
+are dropped beyond it (about 80 MB)"""
+
+trees: OrderedDict[Tuple[Hashable, int], Tuple[int, Tree]] = OrderedDict()
+"""Search trees kept between turns: (match id, player) -> (number of plays, tree)"""
+
+knowledges: OrderedDict[Tuple[Hashable, int], Knowledge] = OrderedDict()
+"""Knowledge on the hidden cards kept between turns: (match id, player) -> knowledge"""
+
+def upper_confidence_bound(tree: Tree, node: int, k: float = K) -> float:
+    """Output Upper Confidence Bound formula result for the given node """
+    visits: int = tree.visits[node]
+    return tree.rewards[node] / visits + k * sqrt(log(tree.availability[node]) / visits)
+
+def logistic(x: float) -> float:
+    """Apply the logistic function to the input """
+    return 1/(1+exp(-x))
+
+def new_knowledge(player: int, init_trump_card: Card) -> Knowledge:
+    """Returns the knowledge of the player on the hidden cards before any play
+        it is updated play after play, tracking as masks of compact cards:
+            unknown: cards not seen played yet (some may be known from the player's state)
+            not_in_hand: unknown cards that cannot be in the opponent hand
+            opponent_hand: cards known to be in the opponent hand
+            cuts: cards of the suits the opponent does not have
+            max_one: cards of the suits the opponent has at most one card of
+        and the trump card, the leading compact play of the current trick (-1 if none),
+        the pending special play (3, 5 or None) and the number of plays seen"""
+    return {
+        "player": player,
+        "nb_plays": 0,
+        "last_play": None,
+        "unknown": (1 << NB_CARDS) - 1,
+        "not_in_hand": 0,
+        "opponent_hand": 0,
+        "cuts": 0,
+        "max_one": 0,
+        "trump_card": card_to_int(init_trump_card),
+        "lead": -1,
+        "special_type": None
+    }
+
+def _learn_from_play(knowledge: Knowledge, play: Play) -> None:
+    """Update the knowledge with one play"""
+    opponent: int = other_player(knowledge["player"])
+    card: CardInt = NO_CARD if play[1][0] is None else card_to_int(play[1])
+    if card == NO_CARD:
+        # Secret discard of the opponent
+        knowledge["special_type"] = None
+        return
+    bit: Mask = 1 << card
+    if play[0] == opponent:
+        if knowledge["opponent_hand"] & bit:
+            knowledge["opponent_hand"] ^= bit
+        elif knowledge["max_one"] & bit:
+            knowledge["max_one"] &= ~FOLLOW_MASKS[card]
+            knowledge["cuts"] |= FOLLOW_MASKS[card]
+    knowledge["unknown"] &= ~bit
+    knowledge["not_in_hand"] &= ~bit
+    if knowledge["special_type"] is not None:
+        if knowledge["special_type"] == 3:
+            knowledge["trump_card"] = card
+        knowledge["special_type"] = None
+        return
+    lead: int = knowledge["lead"]
+    if lead == -1:
+        knowledge["lead"] = play[0] << 6 | card
+    else:
+        knowledge["lead"] = -1
+        lead_card: CardInt = lead & 63
+        if play[0] == opponent:
+            if CARD_SUITS[card] != CARD_SUITS[lead_card]:
+                knowledge["cuts"] |= FOLLOW_MASKS[lead_card]
+                knowledge["max_one"] &= ~FOLLOW_MASKS[lead_card]
+            elif CARD_VALUES[lead_card] == 11 and CARD_VALUES[card] not in (1, 10):
+                # The opponent had to follow the 11 with its highest card (or the 1)
+                higher: Mask = sum(1 << (card - CARD_VALUES[card] + value)
+                                   for value in range(CARD_VALUES[card] + 1, 11))
+                knowledge["not_in_hand"] |= knowledge["unknown"] & higher
+                knowledge["unknown"] &= ~higher
+    if CARD_VALUES[card] == 5:
+        if play[0] == opponent:
+            # The opponent drew an unknown card and may have discarded any card, it has at
+            # most the drawn card of the suits it did not have (but known cards of them, as
+            # the trump card taken with a 3, may have been kept besides the drawn card)
+            cuts: Mask = knowledge["cuts"]
+            for suit_mask in SUIT_MASKS:
+                if knowledge["opponent_hand"] & suit_mask:
+                    cuts &= ~suit_mask
+            knowledge["max_one"] |= cuts
+            knowledge["unknown"] |= knowledge["not_in_hand"] | knowledge["opponent_hand"]
+            knowledge["cuts"] = 0
+            knowledge["not_in_hand"] = 0
+            knowledge["opponent_hand"] = 0
+        knowledge["special_type"] = 5
+    elif CARD_VALUES[card] == 3:
+        if play[0] == opponent:
+            trump_bit: Mask = 1 << knowledge["trump_card"]
+            knowledge["opponent_hand"] |= trump_bit
+            knowledge["unknown"] &= ~trump_bit
+            knowledge["not_in_hand"] &= ~trump_bit
+        knowledge["special_type"] = 3
+
+def update_knowledge(knowledge: Knowledge, state: State) -> Knowledge:
+    """Update the knowledge with the plays of the state not seen yet and returns it
+        the constraint masks on the hidden cards used by random_hidden_cards are then:
+            remaining: cards that may be in the opponent hand
+            draw_deck: hidden cards that cannot be in the opponent hand
+            opponent_hand and max_one
+        with the compact cards of remaining and draw_deck in remaining_cards and
+        draw_deck_cards"""
+    for play in state["plays"][knowledge["nb_plays"]:]:
+        _learn_from_play(knowledge, play)
+    knowledge["nb_plays"] = len(state["plays"])
+    knowledge["last_play"] = state["plays"][-1] if state["plays"] else None
+    player: int = knowledge["player"]
+    known: Mask = (cards_to_mask(state["hands"][player])
+                   | cards_to_mask(state["discards"][0])
+                   | cards_to_mask(state["discards"][1])
+                   | cards_to_mask(state["private_discards"][player]))
+    if state["trump_card"]:
+        known |= 1 << card_to_int(state["trump_card"])
+    unknown: Mask = knowledge["unknown"] & ~known
+    knowledge["remaining"] = unknown & ~knowledge["cuts"]
+    knowledge["draw_deck"] = (knowledge["not_in_hand"] & ~known) | (unknown & knowledge["cuts"])
+    knowledge["remaining_cards"] = mask_to_ints(knowledge["remaining"])
+    knowledge["draw_deck_cards"] = mask_to_ints(knowledge["draw_deck"])
+    return knowledge
+
+def aquire_knowledge(state: State) -> Knowledge:
+    """Extract knowledge on current state from past plays """
+    return update_knowledge(new_knowledge(state["current_player"], state["init_trump_card"]),
+                            state)
+
+def match_knowledge(key: Tuple[Hashable, int], state: State) -> Knowledge:
+    """Returns the knowledge kept for the key updated with the plays made since, or the
+    knowledge acquired from all the plays if the kept one does not apply to the state"""
+    knowledge: Union[Knowledge, None] = knowledges.pop(key, None)
+    if (knowledge is None or knowledge["player"] != key[1]
+            or knowledge["nb_plays"] > len(state["plays"])
+            or (knowledge["nb_plays"]
+                and state["plays"][knowledge["nb_plays"] - 1] != knowledge["last_play"])):
+        knowledge = update_knowledge(new_knowledge(key[1], state["init_trump_card"]), state)
+    else:
+        update_knowledge(knowledge, state)
+    knowledges[key] = knowledge
+    while len(knowledges) > MAX_TREES:
+        knowledges.popitem(last=False)
+    return knowledge
+
+def random_hidden_cards(state: State, knowledge: Knowledge) -> Tuple[Mask, Mask, List[CardInt]]:
+    """Output a possible random opponent hand and opponent private discards (masks) and
+    draw deck (compact cards) with the given knowledge """
+    remaining: List[CardInt] = list(knowledge["remaining_cards"])
+    draw_deck: List[CardInt] = list(knowledge["draw_deck_cards"])
+    opponent: int = other_player(knowledge["player"])
+    opponent_hand: Mask = knowledge["opponent_hand"]
+    max_one: Mask = knowledge["max_one"]
+    nbr_unknown_cards_opp_hand: int = len(state["hands"][opponent]) - opponent_hand.bit_count()
+    shuffle(remaining)
+    if knowledge["remaining"] & max_one:
+        others: List[CardInt] = []
+        excluded: Mask = 0
+        for card in remaining:
+            if excluded >> card & 1:
+                draw_deck.append(card)
+            elif nbr_unknown_cards_opp_hand:
+                opponent_hand |= 1 << card
+                nbr_unknown_cards_opp_hand -= 1
+                if max_one >> card & 1:
+                    # No other card of this suit in the opponent hand
+                    excluded |= FOLLOW_MASKS[card]
+            else:
+                others.append(card)
+    else:
+        for card in remaining[:nbr_unknown_cards_opp_hand]:
+            opponent_hand |= 1 << card
+        others = remaining[nbr_unknown_cards_opp_hand:]
+    nbr_private_discards: int = len(state["private_discards"][opponent])
+    private_discards: Mask = 0
+    for card in others[:nbr_private_discards]:
+        private_discards |= 1 << card
+    draw_deck += others[nbr_private_discards:]
+    shuffle(draw_deck)
+    for _ in range(nbr_private_discards - min(nbr_private_discards, len(others))):
+        # Cards of a suit the opponent lacks may also have been discarded before
+        private_discards |= 1 << draw_deck.pop()
+    return opponent_hand, private_discards, draw_deck
+
+def random_state(state: State, knowledge: Knowledge) -> State:
+    """Output a possible random state with the given knowledge """
+    rand_state: State = copy_state(state)
+    opponent: int = other_player(knowledge["player"])
+    opponent_hand, private_discards, draw_deck = random_hidden_cards(state, knowledge)
+    rand_state["hands"][opponent] = mask_to_cards(opponent_hand)
+    rand_state["private_discards"][opponent] = mask_to_cards(private_discards)
+    rand_state["draw_deck"] = [int_to_card(card) for card in draw_deck]
+    return rand_state
+
+def select(tree: Tree, node: int, cstate: CompactState, k: float = K) -> int:
+    """Select one of the allowed children based on UCT calculation
+        Returns NO_NODE if the node has no child and the tree is full"""
+    allowed: List[int] = compact_list_allowed(cstate)
+    children: array = tree.children
+    start: int = node * NB_CARDS
+    list_children: List[int] = []
+    for play in allowed:
+        child: int = children[start + (play & 63)]
+        if not child:
+            child = tree.add_child(node, play)
+            if child == NO_NODE:
+                continue
+        tree.availability[child] += 1
+        list_children.append(child)
+    min_max: float = -1
+    selected: int = NO_NODE
+    for child in list_children:
+        if tree.visits[child] == 0:
+            return child
+        value: float = upper_confidence_bound(tree, child, k)
+        if value > min_max:
+            min_max = value
+            selected = child
+    return selected
+
+def batch_reward(cstate: CompactState, player: int, playouts: int,
+                 rng: np.random.Generator) -> float:
+    """Returns the average reward of the player over random playouts of the compact state
+    played at once on the batch engine"""
+    games: Batch = repeat_batch(cstate, playouts)
+    batch_random_playout(games, rng)
+    scores: np.ndarray = batch_get_score(games)
+    return float(np.mean(1 / (1 + np.exp(scores[:, other_player(player)] - scores[:, player]))))
+
+def search(state: State, knowledge: Knowledge, tree: Tree, deadline: Union[float, None],
+           budget: Union[int, None], k: float = K, rollout: str = ROLLOUT_POLICY,
+           playouts: int = LEAF_PLAYOUTS, stop: Union[Callable[[], bool], None] = None) -> int:
+    """Run MCTS simulations from the root until the deadline (a time() value) or the budget of
+    simulations is reached, or as soon as the most visited child of the root cannot be
+    overtaken with the simulations left, or stop() returns True
+        Simulations are from the point of view of the player of the knowledge, the player
+        to play at the root may be its opponent
+        Returns the most visited child of the root, NO_NODE if the tree is full and the
+        root has no children"""
+    player: int = knowledge["player"]
+    opponent: int = other_player(player)
+    root_state: CompactState = compact_state(random_state(state, knowledge),
+                                             knowledge["special_type"])
+    policy: Policy = POLICIES[rollout]
+    rng: np.random.Generator = np.random.default_rng(getrandbits(64))
+    nb_hand: int = len(state["hands"][opponent])
+    nb_private: int = len(state["private_discards"][opponent])
+    hands: List[Mask] = []
+    private_discards: List[Mask] = []
+    draw_decks: List[List[CardInt]] = []
+    visits: array = tree.visits
+    rewards: array = tree.rewards
+    parents: array = tree.parents
+    plays: array = tree.plays
+    endgame_table.new_search()
+    start_time = time()
+    done: int = 0
+    while True:
+        runs: int = CHECK_INTERVAL if budget is None else max(1, min(CHECK_INTERVAL, budget - done))
+        for _ in range(runs):
+            if not draw_decks:
+                hands, private_discards, draw_decks = sample_hidden_masks(
+                    knowledge, nb_hand, nb_private, DETERMINIZATIONS, rng)
+            # Each determinization is played in place on its own copy of the root state
+            rand_state: CompactState = copy_compact_state(root_state)
+            rand_state["hands"][opponent] = hands.pop()
+            rand_state["private_discards"][opponent] = private_discards.pop()
+            rand_state["draw_deck"][:] = array('b', draw_decks.pop())
+            node: int = ROOT
+            score_diff: Union[int, None] = None
+            reward: Union[float, None] = None
+            expanding: bool = True
+            while rand_state["hands"][0] or rand_state["hands"][1]:
+                if expanding and visits[node] >= EXPANSION_THRESHOLD:
+                    child: int = select(tree, node, rand_state, k)
+                    if child != NO_NODE:
+                        node = child
+                        compact_do_step(rand_state, plays[node])
+                        continue
+                    expanding = False
+                if (rand_state["hands"][0].bit_count() + rand_state["hands"][1].bit_count()
+                        <= ENDGAME_CARDS):
+                    score_diff = solve(rand_state, player, endgame_table)
+                    break
+                if playouts > 1:
+                    reward = batch_reward(rand_state, player, playouts, rng)
+                    break
+                expanding = False
+                compact_do_step(rand_state, policy(rand_state, compact_list_allowed(rand_state)))
+            if reward is None:
+                if score_diff is None:
+                    scores = compact_get_score(rand_state)
+                    score_diff = scores[player] - scores[other_player(player)]
+                reward = logistic(score_diff)
+            while node != ROOT:
+                visits[node] += 1
+                if plays[node] >> 6 == player:
+                    rewards[node] += reward
+                else:
+                    rewards[node] += 1 - reward
+                node = parents[node]
+            visits[ROOT] += 1
+        done += runs
+        children: List[int] = tree.get_children(ROOT)
+        if not children:
+            if len(tree) >= tree.max_nodes:
+                # The root cannot be expanded any more
+                return NO_NODE
+            continue
+        remaining: float = float("inf") if budget is None else budget - done
+        if deadline is not None:
+            now: float = time()
+            remaining = min(remaining, done / max(now - start_time, 1e-6) * (deadline - now))
+        most_visited: List[int] = sorted((visits[child] for child in children), reverse=True)
+        if (remaining <= 0 or most_visited[0] - (most_visited[1:] or [0])[0] > remaining
+                or (stop is not None and stop())):
+            break
+    return max(children, key=lambda x:(visits[x], rewards[x]))
+
+def root_statistics(tree: Tree) -> RootStatistics:
+    """Returns the visits and total reward of each child of the root, by compact play"""
+    return {tree.plays[child]: (tree.visits[child], tree.rewards[child])
+            for child in tree.get_children(ROOT)}
+
+def merge_root_statistics(results: List[RootStatistics]) -> RootStatistics:
+    """Sum the root statistics of independent searches"""
+    merged: RootStatistics = {}
+    for statistics in results:
+        for play, (visits, reward) in statistics.items():
+            total_visits, total_reward = merged.get(play, (0, 0.0))
+            merged[play] = (total_visits + visits, total_reward + reward)
+    return merged
+
+def permute_statistics(statistics: RootStatistics, permutation: Permutation) -> RootStatistics:
+    """Returns the root statistics with the suits of the plays relabelled"""
+    return {permute_compact_play(play, permutation): value for play, value in statistics.items()}
+
+def _worker_search(arguments: SearchArguments) -> RootStatistics:
+    """Run a search in a worker process with its own random seed, returns the root statistics"""
+    game, knowledge, deadline, budget, k, rollout, playouts, worker_seed = arguments
+    seed(worker_seed)
+    state: State = get_state_from_game(game)
+    if knowledge is None:
+        knowledge = aquire_knowledge(state)
+    tree: Tree = Tree()
+    search(state, knowledge, tree, deadline, budget, k, rollout, playouts)
+    return root_statistics(tree)
+
+def _get_pool(workers: int) -> Pool:
+    """Returns the pool of worker processes of the given size, created on first use"""
+    if workers not in pools:
+        if not pools:
+            atexit.register(close_pools)
+        pools[workers] = Pool(workers)
+    return pools[workers]
+
+def close_pools() -> None:
+    """Stop the worker processes of the parallel search, called at exit"""
+    while pools:
+        pool: Pool = pools.popitem()[1]
+        pool.close()
+        pool.join()
+
+def parallel_search(game: Game, deadline: Union[float, None], budget: Union[int, None],
+                    k: float, workers: int, rollout: str = ROLLOUT_POLICY,
+                    knowledge: Union[Knowledge, None] = None,
+                    playouts: int = LEAF_PLAYOUTS) -> RootStatistics:
+    """Root parallel MCTS: run independent searches on several processes, each one with its
+    own random determinizations and a share of the budget, and returns their merged root
+    statistics (the knowledge is acquired by each worker if not given)"""
+    if budget is not None:
+        budget = -(-budget // workers)
+    arguments: List[SearchArguments] = [
+        (game, knowledge, deadline, budget, k, rollout, playouts, getrandbits(32))
+        for _ in range(workers)]
+    return merge_root_statistics(_get_pool(workers).map(_worker_search, arguments))
+
+def best_play(statistics: RootStatistics) -> int:
+    """Returns the compact play the most visited in root statistics (the most rewarded of
+    them in case of a tie)"""
+    return max(statistics, key=lambda play: statistics[play])
+
+def reuse_tree(key: Tuple[Hashable, int], game: Game,
+               allowed: Union[Set[int], None] = None) -> Tree:
+    """Returns the search tree kept for the key, cut to the subtree of the plays made since
+    it was kept (statistics of this subtree still apply), or a new tree if it does not apply
+        with allowed compact plays, the children of the root for other plays (cards the
+        player did not draw in the real game) are dropped"""
+    entry: Union[Tuple[int, Tree], None] = trees.pop(key, None)
+    if entry is None:
+        return Tree()
+    nb_plays, tree = entry
+    if nb_plays > len(game["plays"]):
+        return Tree()
+    node: int = ROOT
+    for step in game["plays"][nb_plays:]:
+        if step[1][0] is None:
+            return Tree()
+        play: int = play_to_int(step)
+        node = tree.children[node * NB_CARDS + (play & 63)]
+        if not node or tree.plays[node] != play:
+            return Tree()
+    if allowed is not None and any(tree.plays[child] not in allowed
+                                   for child in tree.get_children(node)):
+        return tree.subtree(node, allowed)
+    return tree.subtree(node) if node != ROOT else tree
+
+def keep_tree(key: Tuple[Hashable, int], game: Game, tree: Tree) -> None:
+    """Keep the search tree of the game for the next turn, dropping the least recently used
+    ones beyond MAX_TREES trees or MAX_KEPT_NODES nodes"""
+    trees[key] = (len(game["plays"]), tree)
+    trees.move_to_end(key)
+    nb_nodes: int = sum(len(kept) for _, kept in trees.values())
+    while len(trees) > MAX_TREES or (nb_nodes > MAX_KEPT_NODES and len(trees) > 1):
+        nb_nodes -= len(trees.popitem(last=False)[1][1])
+
+def forget_match(match_id: Hashable) -> None:
+    """Drop the search trees and knowledges kept for a match, once it has no decision left"""
+    for key in [key for key in trees if key[0] == match_id]:
+        del trees[key]
+    for key in [key for key in knowledges if key[0] == match_id]:
+        del knowledges[key]
+
+def _fallback_play(state: State, knowledge: Knowledge, rollout: str) -> Play:
+    """Returns the play of the rollout policy on a determinization, when no search could be
+    made"""
+    cstate: CompactState = compact_state(random_state(state, knowledge),
+                                         knowledge["special_type"])
+    return int_to_play(POLICIES[rollout](cstate, compact_list_allowed(cstate)))
+
+def select_play(game: Game, duration: Union[float, None], runs: Union[int, None], k: float = K,
+                workers: int = NB_WORKERS, match_id: Hashable = None,
+                deadline: Union[float, None] = None,
+                rollout: str = ROLLOUT_POLICY, playouts: int = LEAF_PLAYOUTS,
+                cache: Union[DecisionCache, None] = None,
+                book: Union[OpeningBook, None] = None) -> Union[Play, bool]:
+    """Select one play based on MCTS simulations, a forced play is returned at once
+        the search stops at the deadline (a time() value, by default in duration seconds)
+        or after runs simulations, whichever comes first
+        with a cache, the game must be a get_player_game() view, the root statistics of its
+        information set are looked up before searching and stored after
+        with an opening book, the game must be a get_player_game() view, the play of the book
+        is returned at once for the first decision of the deal"""
+    state: State = get_state_from_game(game)
+    allowed: List[Play] = list_allowed(state, state["current_player"])
+    if len(allowed) == 0:
+        return False
+    if len(allowed) == 1:
+        return allowed[0]
+    if book is not None:
+        opening: Union[Play, None] = book.lookup(game)
+        if opening is not None and opening in allowed:
+            return opening
+    if deadline is None and duration is not None:
+        deadline = time() + duration
+    if deadline is None and runs is None:
+        raise ValueError("The search needs a duration, a deadline or a number of simulations")
+    cache_key: str = ""
+    permutation: Permutation = IDENTITY
+    if cache is not None:
+        # Decisions are cached with the plays of the canonical suit relabelling
+        permutation = canonical_permutation(game)
+        cache_key = information_set_key(game, {"duration": duration, "runs": runs, "k": k,
+                                               "workers": workers, "rollout": rollout,
+                                               "playouts": playouts})
+        cached: Union[RootStatistics, None] = cache.get(cache_key)
+        if cached:
+            return int_to_play(permute_compact_play(best_play(cached),
+                                                    inverse_permutation(permutation)))
+    key: Tuple[Hashable, int] = (match_id, state["current_player"])
+    knowledge: Knowledge = (match_knowledge(key, state) if match_id is not None
+                            else aquire_knowledge(state))
+    if workers > 1:
+        statistics: RootStatistics = parallel_search(game, deadline, runs, k, workers, rollout,
+                                                     knowledge, playouts)
+        if cache is not None:
+            cache.store(cache_key, permute_statistics(statistics, permutation))
+        if not statistics:
+            return _fallback_play(state, knowledge, rollout)
+        return int_to_play(best_play(statistics))
+
+    tree: Tree = (reuse_tree(key, game, {play_to_int(step) for step in allowed})
+                  if match_id is not None else Tree())
+    if runs is not None:
+        # Simulations of the reused tree (previous turns or pondering) count in the budget
+        runs = max(1, runs - tree.visits[ROOT])
+    selected: int = search(state, knowledge, tree, deadline, runs, k, rollout, playouts)
+    if match_id is not None:
+        keep_tree(key, game, tree)
+    if selected == NO_NODE:
+        return _fallback_play(state, knowledge, rollout)
+    if cache is not None:
+        cache.store(cache_key, permute_statistics(root_statistics(tree), permutation))
+    return int_to_play(tree.plays[selected])
+
+def ponder(game: Game, match_id: Hashable, stop: Union[Callable[[], bool], None] = None,
+           duration: Union[float, None] = PONDER_DURATION, k: float = K,
+           rollout: str = ROLLOUT_POLICY, playouts: int = LEAF_PLAYOUTS) -> None:
+    """Search during the opponent's turn from the point of view of the player of the game
+    (a get_player_game() view), until stop() returns True or for duration seconds
+        the search tree is kept, on the next turn the search continues from the subtree of
+        the play made by the opponent, and stops early if it is already explored enough"""
+    state: State = get_state_from_game(game)
+    player: int = game["player"]
+    if duration is None or not state["hands"][player] or state["current_player"] == player:
+        return
+    key: Tuple[Hashable, int] = (match_id, player)
+    knowledge: Knowledge = match_knowledge(key, state)
+    tree: Tree = reuse_tree(key, game)
+    search(state, knowledge, tree, time() + duration, None, k, rollout, playouts, stop)
+    keep_tree(key, game, tree)
+
+def ai_play(game: Game, duration: Union[float, None]=TURN_DURATION,
+            runs: Union[int, None]=NB_SIMUL_P0, k: float=K, workers: int=NB_WORKERS,
+            match_id: Hashable=None, deadline: Union[float, None]=None,
+            rollout: str=ROLLOUT_POLICY, playouts: int=LEAF_PLAYOUTS,
+            cache: Union[DecisionCache, None]=None,
+            book: Union[OpeningBook, None]=None) -> Union[Play, bool]:
+    """Select a play and return it
+        with a match id, the search tree and the knowledge on the hidden cards are kept and
+        reused on the next turns of the match
+        with a decision cache, plays of information sets already searched are returned at once
+        with an opening book, the first decision of the deal is read from the book"""
+    return select_play(game, duration, runs, k, workers, match_id, deadline, rollout, playouts,
+                       cache, book)
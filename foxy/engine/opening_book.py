@@ -0,0 +1,167 @@
+"""Opening book of the Fox in the Forest AIs
+
+The first decision of a deal only depends on the hand of the player, the trump
+card and, when the opponent leads, the card it led. Exact hands are too many to
+be met again, so the book is keyed by an abstraction of the position: for each
+suit, the number of cards of the player and whether it holds the 11 and the 1;
+the trump suit; and the suit and class of the card led (see opening_key()).
+Suits are ordered by the abstraction, the trump suit first, so that positions
+equivalent by suit relabelling share their key.
+
+A play of the book is abstract too: the position of the suit in this order and
+the rank of the card among the cards of the suit of the player, from the highest.
+The book stores the play chosen most often by deep offline searches (see
+build_opening_book.py) of the positions of each key, so that they are answered
+without searching.
+
+A book file is the MAGIC bytes followed by records sorted by key, each one a
+little-endian uint64 key and the uint8 abstract play (suit position * 16 + rank).
+It is memory-mapped and searched by bisection, so that the processes of a
+machine share it without loading it.
+"""
+from __future__ import annotations
+from typing import Dict, List, Tuple, Union
+import os
+
+import numpy as np
+
+from foxy.engine.foxintheforest import (
+    Game, Play, CardInt, COLORS, NO_CARD, CARD_SUITS, CARD_VALUES, card_to_int, int_to_card
+)
+
+MAGIC: bytes = b"FOXBOOK3"
+"""Start of the book files"""
+
+RECORD: np.dtype = np.dtype([("key", "<u8"), ("play", "u1")])
+"""Record of a book file"""
+
+LEAD_CLASSES: List[int] = [0, 1, 2, 2, 2, 2, 2, 7, 7, 9, 7, 11]
+"""Class of the card led by value: the 1, the 9 and the 11 have their own class, the
+other cards are low (2 to 6) or high (7, 8 and 10)"""
+
+books: Dict[str, OpeningBook] = {}
+"""Opened books by path"""
+
+def _suit_features(values: List[int]) -> int:
+    """Returns the abstraction of the values of the cards of a suit of a hand: the number
+    of cards (bits 0 to 3), the 11 (bit 4) and the 1 (bit 5)"""
+    return len(values) | (11 in values) << 4 | (1 in values) << 5
+
+def _hand_values(game: Game) -> List[List[int]]:
+    """Returns the values of the cards of the player's hand in each suit, highest first"""
+    values: List[List[int]] = [[] for _ in COLORS]
+    for card in game["init_hands"][game["player"]]:
+        values[COLORS.index(card[1])].append(card[0])
+    for suit_values in values:
+        suit_values.sort(reverse=True)
+    return values
+
+def opening_position(game: Game) -> Union[Tuple[int, List[int]], None]:
+    """Returns the book key of the position of a get_player_game() view and its suits (as
+    indexes of COLORS) in the order of the key, None if it is not the first decision of the
+    player in the deal
+        bits 6 * n to 6 * n + 5: features of the nth suit (see _suit_features()), the
+        trump suit first and the other two by features (the suit led first if they tie),
+        bits 18 and 19: position of the suit led plus one (0 if the player leads),
+        bits 20 to 23: class of the card led (see LEAD_CLASSES)"""
+    player: int = game["player"]
+    plays: List[Play] = game["plays"]
+    lead: CardInt = NO_CARD
+    if len(plays) == 1 and plays[0][0] != player:
+        lead = card_to_int(plays[0][1])
+        if CARD_VALUES[lead] in (3, 5):
+            # The opponent plays again
+            return None
+    elif plays or game["first_player"] != player:
+        return None
+    values: List[List[int]] = _hand_values(game)
+    features: List[int] = [_suit_features(suit_values) for suit_values in values]
+    trump_suit: int = CARD_SUITS[card_to_int(game["init_trump_card"])]
+    lead_suit: int = NO_CARD if lead == NO_CARD else CARD_SUITS[lead]
+    # Suits with the same features are ordered by their cards, so that relabelled
+    # positions map the abstract plays to the relabelled cards
+    suits: List[int] = [trump_suit] + sorted(
+        (suit for suit in range(len(COLORS)) if suit != trump_suit),
+        key=lambda suit: (features[suit], suit != lead_suit, values[suit]))
+    key: int = sum(features[suit] << (6 * position) for position, suit in enumerate(suits))
+    if lead != NO_CARD:
+        key |= (suits.index(lead_suit) + 1) << 18 | LEAD_CLASSES[CARD_VALUES[lead]] << 20
+    return key, suits
+
+def opening_key(game: Game) -> Union[int, None]:
+    """Returns the book key of the position of a get_player_game() view, None if it is not
+    the first decision of the player in the deal"""
+    position: Union[Tuple[int, List[int]], None] = opening_position(game)
+    return None if position is None else position[0]
+
+def abstract_play(game: Game, suits: List[int], card: CardInt) -> int:
+    """Returns the abstract play of a card of the player's hand, suits being the order of
+    the suits of the key of the position"""
+    suit: int = CARD_SUITS[card]
+    return suits.index(suit) << 4 | _hand_values(game)[suit].index(CARD_VALUES[card])
+
+def concrete_card(game: Game, suits: List[int], play: int) -> Union[CardInt, None]:
+    """Returns the card of the player's hand of an abstract play, None if there is none"""
+    values: List[int] = _hand_values(game)[suits[play >> 4]]
+    if (play & 15) >= len(values):
+        return None
+    return card_to_int([values[play & 15], COLORS[suits[play >> 4]]])
+
+class OpeningBook():
+    """Opening book read from a memory-mapped file
+    Args:
+        path (str): path of the book file
+
+    Attributes:
+        records (np.ndarray): records of the book, sorted by key
+    """
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not an opening book")
+        self.records: np.ndarray
+        if os.path.getsize(path) > len(MAGIC):
+            self.records = np.memmap(path, dtype=RECORD, mode="r", offset=len(MAGIC))
+        else:
+            self.records = np.zeros(0, dtype=RECORD)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, key: int) -> Union[int, None]:
+        """Returns the abstract play stored for the key, None if there is none"""
+        keys: np.ndarray = self.records["key"]
+        index: int = int(np.searchsorted(keys, key))
+        if index < len(keys) and keys[index] == key:
+            return int(self.records["play"][index])
+        return None
+
+    def lookup(self, game: Game) -> Union[Play, None]:
+        """Returns the play of the book for a get_player_game() view, None if there is none"""
+        position: Union[Tuple[int, List[int]], None] = opening_position(game)
+        if position is None:
+            return None
+        play: Union[int, None] = self.get(position[0])
+        if play is None:
+            return None
+        card: Union[CardInt, None] = concrete_card(game, position[1], play)
+        return None if card is None else [game["player"], int_to_card(card)]
+
+def write_book(path: str, entries: Dict[int, int]) -> None:
+    """Write a book file of abstract plays by key"""
+    records: np.ndarray = np.array(sorted(entries.items()), dtype=RECORD)
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(records.tobytes())
+
+def read_book(path: str) -> Dict[int, int]:
+    """Returns the abstract plays by key of a book file"""
+    return {int(key): int(play) for key, play in OpeningBook(path).records}
+
+def open_book(path: Union[str, None]) -> Union[OpeningBook, None]:
+    """Returns the book of the path, opened once per process, None if there is no such file"""
+    if path is None or not os.path.exists(path):
+        return None
+    if path not in books:
+        books[path] = OpeningBook(path)
+    return books[path]
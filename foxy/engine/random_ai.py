@@ -0,0 +1,18 @@
+"""Dummy "AI" for the Fox in the Forest game
+
+This AI only returns a random allowed play
+"""
+from __future__ import annotations
+from typing import List, Union, Hashable
+from random import choice
+
+from foxy.engine.foxintheforest import list_allowed, get_state_from_game, State, Game, Play
+
+def ai_play(game: Game, match_id: Hashable = None) -> Union[Play, bool]:
+    """Select a random allowed play and returns it
+        match_id is unused, it is part of the interface of the AIs"""
+    state: State = get_state_from_game(game)
+    allowed: List[Play] = list_allowed(state, state["current_player"])
+    if len(allowed) == 0:
+        return False
+    return choice(allowed)
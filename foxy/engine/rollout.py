@@ -0,0 +1,77 @@
+"""Rollout policies of the Fox in the Forest AIs
+
+A rollout policy chooses the plays of both players in the playouts of a search,
+from a compact state and its allowed compact plays (see foxintheforest.py).
+
+    random: uniformly random allowed play
+    heuristic: cheap rules (follow with the cheapest winning card or dump the
+        highest losing one, keep trumps when leading, and aim at winning 7 to 9
+        tricks or at most 3 as rewarded by get_score()), with some randomness
+
+Policies are found by name in POLICIES.
+"""
+from __future__ import annotations
+from typing import Callable, Dict, List
+from random import choice, random
+
+from foxy.engine.foxintheforest import (
+    CompactState, CARD_SUITS, CARD_VALUES, NB_CARDS, NO_CARD, TRICK_WINNERS
+)
+
+Policy = Callable[[CompactState, List[int]], int]
+
+EPSILON: float = 0.1
+"""Probability of a uniformly random play in the heuristic policy"""
+
+def random_policy(cstate: CompactState, allowed: List[int]) -> int:
+    """Returns a uniformly random allowed play"""
+    return choice(allowed)
+
+def wants_tricks(cstate: CompactState, player: int) -> bool:
+    """Returns True if the player should try to win the current trick: while 7 tricks can still
+    be reached without going over 9, or between 4 and 6 tricks where each trick is a point"""
+    tricks_won: int = cstate["discards"][player].bit_count() // 2
+    if tricks_won >= 9:
+        return False
+    tricks_left: int = 13 - (cstate["discards"][0].bit_count()
+                             + cstate["discards"][1].bit_count()) // 2
+    return tricks_won + tricks_left >= 7 or tricks_won > 3
+
+def heuristic_policy(cstate: CompactState, allowed: List[int]) -> int:
+    """Returns an allowed play chosen by simple card play rules"""
+    if len(allowed) == 1 or random() < EPSILON:
+        return choice(allowed)
+    if cstate["special_type"] is not None:
+        # New trump card or discard: give away the lowest card
+        return min(allowed, key=lambda play: CARD_VALUES[play & 63])
+    player: int = allowed[0] >> 6
+    win: bool = wants_tricks(cstate, player)
+    trump_suit: int = CARD_SUITS[cstate["trump_card"]]
+    other_card: int = cstate["trick"][1 - player]
+    if other_card == NO_CARD:
+        # Lead the highest card to win (keeping trumps), the lowest to lose
+        if win:
+            return max(allowed, key=lambda play: (CARD_SUITS[play & 63] != trump_suit,
+                                                  CARD_VALUES[play & 63]))
+        return min(allowed, key=lambda play: (CARD_SUITS[play & 63] == trump_suit,
+                                              CARD_VALUES[play & 63]))
+    start: int = (cstate["leading_player"] * 3 + trump_suit) * NB_CARDS
+    winning: List[int] = []
+    losing: List[int] = []
+    for play in allowed:
+        if player == 0:
+            index: int = (start + (play & 63)) * NB_CARDS + other_card
+        else:
+            index = (start + other_card) * NB_CARDS + (play & 63)
+        if TRICK_WINNERS[index][0] == player:
+            winning.append(play)
+        else:
+            losing.append(play)
+    if win and winning:
+        return min(winning, key=lambda play: CARD_VALUES[play & 63])
+    if not win and losing:
+        return max(losing, key=lambda play: CARD_VALUES[play & 63])
+    return min(allowed, key=lambda play: CARD_VALUES[play & 63])
+
+POLICIES: Dict[str, Policy] = {"random": random_policy, "heuristic": heuristic_policy}
+"""Rollout policies by name"""
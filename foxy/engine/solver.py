@@ -0,0 +1,83 @@
+"""Perfect information endgame solver for the Fox in the Forest game
+
+Once the hands are small, a determinized state (every card known) can be solved
+exactly: this is an alpha-beta search over the allowed plays of the compact
+engine, with a transposition table, scored with the real rules of get_score().
+Values are stored from the point of view of player 0 so that the same table can
+be shared by both players and by successive decisions.
+
+Point of entry is solve(cstate, player)
+"""
+from __future__ import annotations
+
+from typing import List, Tuple, Union
+
+from foxy.engine.foxintheforest import (
+    CompactState, copy_compact_state, compact_make_step, compact_undo_step, compact_list_allowed,
+    compact_get_score, zobrist_hash
+)
+from foxy.engine.transposition import TranspositionTable
+
+EXACT: int = 0
+LOWER_BOUND: int = 1
+UPPER_BOUND: int = 2
+
+INFINITY: int = 100
+"""More than any score difference"""
+
+def solve(cstate: CompactState, player: int,
+          table: Union[TranspositionTable, None] = None) -> int:
+    """Returns the final score difference (player score - opponent score) reached from the
+    compact state when both players play perfectly
+        the compact state is left unchanged
+        table is a transposition table that can be shared between calls"""
+    if table is None:
+        table = TranspositionTable()
+    # The hash is only kept up to date in the solver, by compact_make_step()
+    cstate = copy_compact_state(cstate)
+    cstate["hash"] = zobrist_hash(cstate)
+    value: int = _alpha_beta(cstate, -INFINITY, INFINITY, table)
+    return value if player == 0 else -value
+
+def _alpha_beta(cstate: CompactState, alpha: int, beta: int, table: TranspositionTable) -> int:
+    """Alpha-beta search of the score difference of player 0"""
+    hands: List[int] = cstate["hands"]
+    if not hands[0] and not hands[1]:
+        score = compact_get_score(cstate)
+        return score[0] - score[1]
+    key: int = cstate["hash"]
+    entry: Union[Tuple[int, int], None] = table.get(key)
+    if entry is not None:
+        value, bound = entry
+        if bound == EXACT:
+            return value
+        if bound == LOWER_BOUND:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+    initial_alpha: int = alpha
+    initial_beta: int = beta
+    maximizing: bool = cstate["current_player"] == 0
+    best: int = -INFINITY if maximizing else INFINITY
+    for step in compact_list_allowed(cstate):
+        undo = compact_make_step(cstate, step)
+        value = _alpha_beta(cstate, alpha, beta, table)
+        compact_undo_step(cstate, undo)
+        if maximizing:
+            best = max(best, value)
+            alpha = max(alpha, best)
+        else:
+            best = min(best, value)
+            beta = min(beta, best)
+        if alpha >= beta:
+            break
+    depth: int = hands[0].bit_count() + hands[1].bit_count()
+    if best <= initial_alpha:
+        table.store(key, depth, best, UPPER_BOUND)
+    elif best >= initial_beta:
+        table.store(key, depth, best, LOWER_BOUND)
+    else:
+        table.store(key, depth, best, EXACT)
+    return best
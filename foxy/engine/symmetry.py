@@ -0,0 +1,159 @@
+"""Suit symmetry of the Fox in the Forest positions
+
+The rules treat the three suits of COLORS alike: only the trump suit and the suit
+led matter, never which of them they are. Relabelling the suits of a position
+gives an equivalent position, whose plays are the relabelled plays and whose
+scores are the same.
+
+canonical_permutation() picks one relabelling for all the equivalent views of a
+player (the suit of the starting trump card becomes the first suit, then the
+other two are ordered by what the player knows), so that caches and precomputed
+tables keyed by canonical positions share their entries between equivalent ones.
+
+A permutation is the tuple of the new suit index (in COLORS) of each suit index.
+"""
+from __future__ import annotations
+from typing import List, Dict, Tuple, Any
+from array import array
+from itertools import permutations
+
+from foxy.engine.foxintheforest import (
+    Card, Play, State, Game, CardInt, Mask, CompactState, COLORS, NB_CARDS, NO_CARD, CARD_SUITS,
+    SUIT_MASKS, cards_to_mask, card_to_int, int_to_card, mask_to_ints
+)
+
+Permutation = Tuple[int, ...]
+Knowledge = Dict[str, Any]
+
+SUIT_SIZE: int = NB_CARDS // len(COLORS)
+"""Number of cards of each suit"""
+
+IDENTITY: Permutation = tuple(range(len(COLORS)))
+"""Permutation keeping every suit"""
+
+SUIT_PERMUTATIONS: List[Permutation] = list(permutations(range(len(COLORS))))
+"""All the relabellings of the suits"""
+
+CARD_PERMUTATIONS: Dict[Permutation, List[CardInt]] = {
+    permutation: [card + (permutation[CARD_SUITS[card]] - CARD_SUITS[card]) * SUIT_SIZE
+                  for card in range(NB_CARDS)]
+    for permutation in SUIT_PERMUTATIONS}
+"""Relabelled compact card of each compact card, by permutation"""
+
+KNOWLEDGE_MASKS: Tuple[str, ...] = ("unknown", "not_in_hand", "opponent_hand", "cuts", "max_one",
+                                    "remaining", "draw_deck")
+"""Keys of the card masks of a good_ai knowledge"""
+
+def inverse_permutation(permutation: Permutation) -> Permutation:
+    """Returns the permutation restoring the suits relabelled by a permutation"""
+    inverse: List[int] = [0] * len(permutation)
+    for suit, new_suit in enumerate(permutation):
+        inverse[new_suit] = suit
+    return tuple(inverse)
+
+def permute_card(card: Card, permutation: Permutation) -> Card:
+    """Returns a relabelled card, hidden cards ([None, None]) and missing trump cards ([])
+    are returned as is"""
+    if not card or card[0] is None:
+        return card
+    return int_to_card(CARD_PERMUTATIONS[permutation][card_to_int(card)])
+
+def permute_cards(cards: List[Card], permutation: Permutation) -> List[Card]:
+    """Returns the list of the relabelled cards, in the same order"""
+    return [permute_card(card, permutation) for card in cards]
+
+def permute_play(step: Play, permutation: Permutation) -> Play:
+    """Returns a relabelled play"""
+    return [step[0], permute_card(step[1], permutation)]
+
+def permute_compact_play(step: int, permutation: Permutation) -> int:
+    """Returns a relabelled compact play"""
+    return (step >> 6) << 6 | CARD_PERMUTATIONS[permutation][step & 63]
+
+def permute_mask(mask: Mask, permutation: Permutation) -> Mask:
+    """Returns the mask of the relabelled cards of a mask"""
+    result: Mask = 0
+    for suit, new_suit in enumerate(permutation):
+        result |= (mask & SUIT_MASKS[suit]) >> (suit * SUIT_SIZE) << (new_suit * SUIT_SIZE)
+    return result
+
+def permute_game(game: Game, permutation: Permutation) -> Game:
+    """Returns a relabelled copy of a Game or of a get_player_game() view"""
+    result: Game = dict(game)
+    result["plays"] = [permute_play(step, permutation) for step in game["plays"]]
+    result["init_draw_deck"] = permute_cards(game["init_draw_deck"], permutation)
+    result["init_trump_card"] = permute_card(game["init_trump_card"], permutation)
+    result["init_hands"] = [permute_cards(hand, permutation) for hand in game["init_hands"]]
+    return result
+
+def permute_state(state: State, permutation: Permutation) -> State:
+    """Returns a relabelled copy of a State"""
+    result: State = dict(state)
+    result["plays"] = [permute_play(step, permutation) for step in state["plays"]]
+    result["trick"] = [None if card is None else permute_card(card, permutation)
+                       for card in state["trick"]]
+    for key in ("private_discards", "discards", "hands"):
+        result[key] = [permute_cards(cards, permutation) for cards in state[key]]
+    result["init_trump_card"] = permute_card(state["init_trump_card"], permutation)
+    result["trump_card"] = permute_card(state["trump_card"], permutation)
+    result["draw_deck"] = permute_cards(state["draw_deck"], permutation)
+    return result
+
+def permute_compact_state(cstate: CompactState, permutation: Permutation) -> CompactState:
+    """Returns a relabelled copy of a compact state"""
+    cards: List[CardInt] = CARD_PERMUTATIONS[permutation]
+    result: CompactState = {
+        "private_discards": [permute_mask(mask, permutation)
+                             for mask in cstate["private_discards"]],
+        "trick": [NO_CARD if card == NO_CARD else cards[card] for card in cstate["trick"]],
+        "current_player": cstate["current_player"],
+        "leading_player": cstate["leading_player"],
+        "discards": [permute_mask(mask, permutation) for mask in cstate["discards"]],
+        "hands": [permute_mask(mask, permutation) for mask in cstate["hands"]],
+        "trump_card": NO_CARD if cstate["trump_card"] == NO_CARD else cards[cstate["trump_card"]],
+        "draw_deck": array('b', [cards[card] for card in cstate["draw_deck"]]),
+        "special_type": cstate["special_type"]
+    }
+    return result
+
+def permute_knowledge(knowledge: Knowledge, permutation: Permutation) -> Knowledge:
+    """Returns a relabelled copy of a good_ai knowledge"""
+    result: Knowledge = dict(knowledge)
+    for key in KNOWLEDGE_MASKS:
+        if key in knowledge:
+            result[key] = permute_mask(knowledge[key], permutation)
+    result["trump_card"] = CARD_PERMUTATIONS[permutation][knowledge["trump_card"]]
+    if knowledge["lead"] != -1:
+        result["lead"] = permute_compact_play(knowledge["lead"], permutation)
+    if knowledge["last_play"] is not None:
+        result["last_play"] = permute_play(knowledge["last_play"], permutation)
+    if "remaining" in knowledge:
+        result["remaining_cards"] = mask_to_ints(result["remaining"])
+        result["draw_deck_cards"] = mask_to_ints(result["draw_deck"])
+    return result
+
+def _view_signature(game: Game, permutation: Permutation) -> Tuple[Any, ...]:
+    """Returns what a player knows of a get_player_game() view once relabelled, as
+    comparable values"""
+    cards: List[CardInt] = CARD_PERMUTATIONS[permutation]
+    return (permute_mask(cards_to_mask(game["init_hands"][game["player"]]), permutation),
+            tuple(NO_CARD if step[1][0] is None else step[0] << 6 | cards[card_to_int(step[1])]
+                  for step in game["plays"]),
+            tuple(NO_CARD if card[0] is None else cards[card_to_int(card)]
+                  for card in game["init_draw_deck"]))
+
+def canonical_permutation(game: Game) -> Permutation:
+    """Returns the relabelling of the canonical form of a get_player_game() view
+        the suit of the starting trump card becomes the first suit, the other two are
+        ordered so that the player's hand, the plays and the cards drawn are the smallest,
+        equivalent views have the same canonical form"""
+    trump_suit: int = CARD_SUITS[card_to_int(game["init_trump_card"])]
+    candidates: List[Permutation] = [permutation for permutation in SUIT_PERMUTATIONS
+                                     if permutation[trump_suit] == 0]
+    return min(candidates, key=lambda permutation: _view_signature(game, permutation))
+
+def canonical_game(game: Game) -> Tuple[Game, Permutation]:
+    """Returns the canonical form of a get_player_game() view and its relabelling, plays of
+    the canonical form are mapped back with permute_play(step, inverse_permutation())"""
+    permutation: Permutation = canonical_permutation(game)
+    return permute_game(game, permutation), permutation
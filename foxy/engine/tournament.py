@@ -0,0 +1,163 @@
+"""Self-play tournament between the AIs of the Fox in the Forest game
+
+Plays games between two AI entries with the game engine only (no web server,
+database or task queue), spread across a pool of processes. Deals are seeded
+and each deal is played twice with the seats swapped, so that results can be
+reproduced and the luck of the deal is balanced.
+
+An entry is an AI name of tasks.AI_dict, optionally followed by settings:
+    TheGood:TURN_DURATION=0.5,NB_SIMUL_P0=200,K=1.0,ROLLOUT=random
+
+Usage:
+    python -m foxy.engine.tournament TheGood TheBad [--games 1000] [--workers 4] [--seed 1]
+"""
+from __future__ import annotations
+from typing import List, Dict, Tuple, Any, Union
+import argparse
+from inspect import signature
+from math import sqrt
+from multiprocessing import Pool
+import random
+import sys
+from time import perf_counter, process_time
+
+from foxy.engine import foxintheforest
+from foxy.engine.foxintheforest import Game
+from foxy.tasks import AI_dict
+
+Entry = Tuple[str, Dict[str, Union[float, str]]]
+GameResult = Dict[str, Any]
+
+SETTINGS: Dict[str, str] = {"TURN_DURATION": "duration", "NB_SIMUL_P0": "runs", "K": "k",
+                            "ROLLOUT": "rollout", "LEAF_PLAYOUTS": "playouts"}
+"""Settings of an entry and the matching argument of ai_play()"""
+
+NB_GAMES: int = 100
+"""Default number of games of a tournament"""
+
+SEED: int = 1
+"""Default seed of the first deal"""
+
+Z_SCORE: float = 1.96
+"""Z-score of the confidence intervals (95%)"""
+
+def parse_entry(text: str) -> Entry:
+    """Returns the AI name and ai_play() arguments of an entry description
+        settings the ai_play() of the AI does not take are rejected"""
+    name, _, settings_text = text.partition(":")
+    if name not in AI_dict:
+        raise ValueError(f"Unknown AI {name}, choose from {', '.join(AI_dict)}")
+    accepted: List[str] = [key for key, argument in SETTINGS.items()
+                           if argument in signature(AI_dict[name].ai_play).parameters]
+    settings: Dict[str, Union[float, str]] = {}
+    for setting in filter(None, settings_text.split(",")):
+        key, _, value = setting.partition("=")
+        if key not in SETTINGS:
+            raise ValueError(f"Unknown setting {key}, choose from {', '.join(SETTINGS)}")
+        if key not in accepted:
+            raise ValueError(f"{name} takes no setting {key}" + (
+                f", choose from {', '.join(accepted)}" if accepted else ""))
+        if key == "ROLLOUT":
+            settings[SETTINGS[key]] = value
+        elif key in ("NB_SIMUL_P0", "LEAF_PLAYOUTS"):
+            settings[SETTINGS[key]] = int(value)
+        else:
+            settings[SETTINGS[key]] = float(value)
+    return name, settings
+
+def play_game(entries: Tuple[Entry, Entry], seed: int, swapped: bool) -> GameResult:
+    """Play one game between two entries, the first one is player 0 unless swapped
+        Returns the scores, numbers of moves and CPU times of each entry"""
+    random.seed(seed)
+    game: Game = foxintheforest.new_game()
+    game_state = foxintheforest.GameState(game)
+    seats: List[Entry] = [entries[1], entries[0]] if swapped else [entries[0], entries[1]]
+    moves: List[int] = [0, 0]
+    cpu: List[float] = [0, 0]
+    while not game_state.is_finished():
+        player: int = game_state.state["current_player"]
+        name, settings = seats[player]
+        start: float = process_time()
+        step = AI_dict[name].ai_play(foxintheforest.get_player_game(game_state.game, player),
+                                     **settings)
+        cpu[player] += process_time() - start
+        moves[player] += 1
+        if not game_state.play(step):
+            raise ValueError(f"{name} played an invalid move: {step}")
+    score: List[int] = foxintheforest.get_score(game_state.state)
+    order: List[int] = [1, 0] if swapped else [0, 1]
+    return {"score": [score[n] for n in order], "moves": [moves[n] for n in order],
+            "cpu": [cpu[n] for n in order]}
+
+def _play_game(arguments: Tuple[Tuple[Entry, Entry], int, bool]) -> GameResult:
+    """play_game() with a single argument, for Pool.imap_unordered()"""
+    return play_game(*arguments)
+
+def wilson_interval(successes: float, total: int, z: float = Z_SCORE) -> Tuple[float, float]:
+    """Returns the Wilson score confidence interval of a proportion"""
+    if total == 0:
+        return 0.0, 1.0
+    proportion: float = successes / total
+    denominator: float = 1 + z * z / total
+    center: float = (proportion + z * z / (2 * total)) / denominator
+    margin: float = z * sqrt(proportion * (1 - proportion) / total
+                             + z * z / (4 * total * total)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+def run_tournament(entries: Tuple[Entry, Entry], nb_games: int = NB_GAMES,
+                   workers: Union[int, None] = None, seed: int = SEED) -> Dict[str, Any]:
+    """Play nb_games between two entries on a pool of workers and returns the statistics
+        wins, draws and losses are counted for the first entry, a draw counts as half a win
+        in the win rate"""
+    games: List[Tuple[Tuple[Entry, Entry], int, bool]] = [
+        (entries, seed + number // 2, number % 2 == 1) for number in range(nb_games)]
+    start: float = perf_counter()
+    with Pool(workers) as pool:
+        results: List[GameResult] = list(pool.imap_unordered(_play_game, games))
+    elapsed: float = perf_counter() - start
+    wins: int = sum(1 for result in results if result["score"][0] > result["score"][1])
+    draws: int = sum(1 for result in results if result["score"][0] == result["score"][1])
+    moves: List[int] = [sum(result["moves"][n] for result in results) for n in range(2)]
+    cpu: List[float] = [sum(result["cpu"][n] for result in results) for n in range(2)]
+    return {
+        "games": nb_games,
+        "wins": wins,
+        "draws": draws,
+        "losses": nb_games - wins - draws,
+        "win_rate": (wins + draws / 2) / nb_games if nb_games else 0.0,
+        "confidence_interval": wilson_interval(wins + draws / 2, nb_games),
+        "points": [sum(result["score"][n] for result in results) / max(nb_games, 1)
+                   for n in range(2)],
+        "games_per_second": nb_games / elapsed,
+        "cpu_per_move": [cpu[n] / moves[n] if moves[n] else 0.0 for n in range(2)]
+    }
+
+def main(argv: Union[List[str], None] = None) -> int:
+    """Command line entry point, returns the exit code"""
+    parser = argparse.ArgumentParser(description="Fox in the Forest AI tournament")
+    parser.add_argument("entries", nargs=2, help="AI entries, e.g. TheGood:TURN_DURATION=0.5")
+    parser.add_argument("-n", "--games", type=int, default=NB_GAMES, help="number of games")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="number of processes (default: number of CPUs)")
+    parser.add_argument("-s", "--seed", type=int, default=SEED, help="seed of the first deal")
+    args = parser.parse_args(argv)
+    try:
+        entries: Tuple[Entry, Entry] = (parse_entry(args.entries[0]),
+                                        parse_entry(args.entries[1]))
+    except ValueError as error:
+        parser.error(str(error))
+
+    stats: Dict[str, Any] = run_tournament(entries, args.games, args.workers, args.seed)
+    low, high = stats["confidence_interval"]
+    print(f"{args.entries[0]} vs {args.entries[1]}: {stats['wins']} wins, {stats['draws']} draws, "
+          f"{stats['losses']} losses")
+    print(f"Win rate of {args.entries[0]}: {stats['win_rate']:.1%} "
+          f"(95% confidence interval {low:.1%} - {high:.1%})")
+    print(f"Average points: {stats['points'][0]:.2f} - {stats['points'][1]:.2f}")
+    print(f"Games per second: {stats['games_per_second']:.2f}")
+    for n in range(2):
+        print(f"CPU seconds per move of {args.entries[n]}: {stats['cpu_per_move'][n]:.4f}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
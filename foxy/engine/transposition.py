@@ -0,0 +1,56 @@
+"""Bounded transposition table for the Fox in the Forest searches
+
+Entries are keyed by the Zobrist hash of a compact state (cstate["hash"], see
+foxintheforest.zobrist_hash()) and stored in fixed size parallel lists, so the
+memory used does not grow with the number of positions searched. Each slot keeps
+the full key to detect collisions, and a new entry replaces the old one if it
+comes from a newer search or if it is at least as deep (more cards left to play).
+"""
+from __future__ import annotations
+from typing import List, Tuple, Union
+
+TABLE_SIZE: int = 2 ** 16
+"""Default number of slots of a transposition table"""
+
+class TranspositionTable:
+    """Fixed size table of (value, bound) search results keyed by Zobrist hash"""
+    def __init__(self, size: int = TABLE_SIZE) -> None:
+        self.size: int = size
+        self.keys: List[int] = [-1] * size
+        self.depths: List[int] = [0] * size
+        self.values: List[int] = [0] * size
+        self.bounds: List[int] = [0] * size
+        self.generations: List[int] = [0] * size
+        self.generation: int = 0
+
+    def get(self, key: int) -> Union[Tuple[int, int], None]:
+        """Returns the (value, bound) stored for the key, None if there is none"""
+        slot: int = key % self.size
+        if self.keys[slot] != key:
+            return None
+        return self.values[slot], self.bounds[slot]
+
+    def store(self, key: int, depth: int, value: int, bound: int) -> None:
+        """Store a search result, unless its slot holds a deeper result of the current search"""
+        slot: int = key % self.size
+        if (self.keys[slot] != key and self.generations[slot] == self.generation
+                and self.depths[slot] > depth):
+            return
+        self.keys[slot] = key
+        self.depths[slot] = depth
+        self.values[slot] = value
+        self.bounds[slot] = bound
+        self.generations[slot] = self.generation
+
+    def new_search(self) -> None:
+        """Start a new search: entries of previous searches are kept but replaced first"""
+        self.generation += 1
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        self.keys = [-1] * self.size
+        self.generations = [0] * self.size
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return self.size - self.keys.count(-1)
@@ -0,0 +1,129 @@
+"""Array-backed Monte Carlo search tree for the Fox in the Forest AIs
+
+Nodes are ints, indexes in parallel arrays of plays, parents, visits, rewards and
+availabilities; node 0 is the root. The children of a node are indexed by the card
+int of their play: they are all plays of the same player, as the player to play only
+depends on the public plays that lead to the node. No object is created per node and
+the number of nodes is capped, so that the memory used by a search is bounded.
+"""
+from __future__ import annotations
+from typing import List, Tuple, Container, Union
+from array import array
+
+from foxy.engine.foxintheforest import NB_CARDS, int_to_play
+
+ROOT: int = 0
+"""Index of the root node"""
+
+NO_NODE: int = -1
+"""Returned instead of a node when the tree is full"""
+
+MAX_NODES: int = 2 ** 18
+"""Default maximum number of nodes of a tree (about 150 bytes per node)"""
+
+_NO_CHILDREN: array = array('i', [0]) * NB_CARDS
+
+class Tree():
+    """Monte Carlo search tree stored in parallel arrays
+    Args:
+        max_nodes (int): maximum number of nodes of the tree
+
+    Attributes:
+        max_nodes (int): maximum number of nodes of the tree
+        plays (array): compact int of the play that lead to each node (-1 for the root)
+        parents (array): parent of each node (-1 for the root)
+        visits (array): number of time each node was visited during the search
+        rewards (array): total reward received by each node
+        availability (array): number of time each node was a possible move to play
+        children (array): children of each node, the child of node n for the card c is
+            at n * NB_CARDS + c (0 if it does not exist)
+    """
+    __slots__ = ("max_nodes", "plays", "parents", "visits", "rewards", "availability",
+                 "children")
+
+    def __init__(self, max_nodes: int = MAX_NODES) -> None:
+        self.max_nodes: int = max_nodes
+        self.plays: array = array('b', [-1])
+        self.parents: array = array('i', [-1])
+        self.visits: array = array('i', [0])
+        self.rewards: array = array('d', [0])
+        self.availability: array = array('i', [0])
+        self.children: array = array('i', _NO_CHILDREN)
+
+    def __len__(self) -> int:
+        return len(self.plays)
+
+    def add_child(self, node: int, play: int) -> int:
+        """Add a child for the compact play to the node and returns it,
+        NO_NODE if the tree is full"""
+        child: int = len(self.plays)
+        if child >= self.max_nodes:
+            return NO_NODE
+        self.plays.append(play)
+        self.parents.append(node)
+        self.visits.append(0)
+        self.rewards.append(0)
+        self.availability.append(0)
+        self.children.extend(_NO_CHILDREN)
+        self.children[node * NB_CARDS + (play & 63)] = child
+        return child
+
+    def get_children(self, node: int) -> List[int]:
+        """Returns the children of the node"""
+        start: int = node * NB_CARDS
+        return [child for child in self.children[start:start + NB_CARDS] if child]
+
+    def subtree(self, node: int, plays: Union[Container[int], None] = None) -> Tree:
+        """Returns a copy of the subtree starting at the node, the node being the new root
+            with plays, only the children of the node for these compact plays are kept and
+            the visits of the others are removed from the new root"""
+        tree: Tree = Tree(self.max_nodes)
+        tree.plays[ROOT] = self.plays[node]
+        tree.visits[ROOT] = self.visits[node]
+        tree.rewards[ROOT] = self.rewards[node]
+        tree.availability[ROOT] = self.availability[node]
+        pending: List[Tuple[int, int]] = [(node, ROOT)]
+        while pending:
+            old, new = pending.pop()
+            for old_child in self.get_children(old):
+                if old == node and plays is not None and self.plays[old_child] not in plays:
+                    tree.visits[ROOT] -= self.visits[old_child]
+                    continue
+                new_child: int = tree.add_child(new, self.plays[old_child])
+                if new_child == NO_NODE:
+                    return tree
+                tree.visits[new_child] = self.visits[old_child]
+                tree.rewards[new_child] = self.rewards[old_child]
+                tree.availability[new_child] = self.availability[old_child]
+                pending.append((old_child, new_child))
+        return tree
+
+    def describe(self, node: int) -> str:
+        """Returns a description of the node"""
+        play = int_to_play(self.plays[node]) if self.plays[node] >= 0 else None
+        return (f'{play} visits:{self.visits[node]} '
+                f'reward:{self.rewards[node]} av.:{self.availability[node]}')
+
+    def show(self, node: int = ROOT, indent: int = 0, depth: int = 1) -> None:
+        """Print the tree in the console starting at the node with the given depth """
+        print("  "*indent + self.describe(node))
+        if depth > 0:
+            for child in sorted(self.get_children(node), key=lambda a: self.visits[a],
+                                reverse=True):
+                self.show(child, indent=indent+1, depth=depth-1)
+
+    def graph(self, node: int = ROOT, depth: int = 1) -> str:
+        """Outputs a Graphviz DOT language representation of the tree """
+        text: str = ""
+        if self.plays[node] >= 0:
+            play = int_to_play(self.plays[node])
+            text += f'{node} [label="{play[0]}:{play[1][0]}{play[1][1]} {self.visits[node]}"];\n'
+        else:
+            text += f'{node} [label="root {self.visits[node]}"];\n'
+        for child in self.get_children(node):
+            text += f"{node} -- {child};\n"
+        if depth > 0:
+            for child in sorted(self.get_children(node), key=lambda a: self.visits[a],
+                                reverse=True):
+                text += self.graph(child, depth=depth-1)
+        return text
@@ -0,0 +1,25 @@
+"""Flask extensions of the Fox in the Forest web site
+
+They are created unbound and attached to the app by foxy.create_app()
+"""
+from flask_sqlalchemy import SQLAlchemy
+from flask_migrate import Migrate
+from flask_bcrypt import Bcrypt
+from flask_login import LoginManager
+from flask_socketio import SocketIO
+from flask_babel import Babel
+from flask_babel import lazy_gettext as _l
+import redis
+from rq import Queue
+
+db = SQLAlchemy()
+migrate = Migrate(render_as_batch=True)
+bcrypt = Bcrypt()
+login_manager = LoginManager()
+login_manager.login_view = 'login'
+login_manager.login_message = _l('Please log in to access this page.')
+login_manager.login_message_category = 'info'
+socketio = SocketIO()
+babel = Babel()
+redis_server = redis.Redis()
+redis_queue = Queue(connection=redis_server)
@@ -3,7 +3,7 @@ from datetime import datetime
 
 from flask_login import UserMixin
 
-from foxy import db, login_manager
+from foxy.extensions import db, login_manager
 
 @login_manager.user_loader
 def load_user(user_id):
@@ -56,14 +56,14 @@ class Games(db.Model):
             0 = created (waiting for second user)
             1 = started
             2 = finished
-        game: game state json dump
+        game: game state, binary encoded (see foxintheforest.encode_game())
     """
     id = db.Column(db.Integer, primary_key=True)
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     match_id = db.Column(db.Integer, db.ForeignKey('matches.id'))
     match = db.relationship("Matches", foreign_keys=[match_id])
     status = db.Column(db.Integer, nullable=False, default=0)
-    game = db.Column(db.String(1000))
+    game = db.Column(db.LargeBinary)
     lock = db.Column(db.Boolean, default=False, nullable=False)
 
     def __repr__(self):
@@ -16,7 +16,8 @@
         play: play a card
 """
 from __future__ import annotations
-from typing import Callable, Union
+from typing import Callable, Union, Tuple
+from collections import OrderedDict
 from random import randint
 
 from flask import flash, render_template, url_for, request, json, redirect
@@ -24,14 +25,21 @@ from flask_login import login_user, logout_user, current_user, login_required
 from flask_socketio import disconnect, emit, join_room
 from flask_babel import _
 
-from foxy import app, db, bcrypt, socketio, redis_queue
+from foxy import get_app
+from foxy.extensions import db, bcrypt, socketio, redis_queue
 from foxy.forms import RegistrationForm, LoginForm
 from foxy.models import User, Matches, Games
-from foxy import foxintheforest
-from foxy.tasks import next_ai_move, AI_dict
+from foxy.engine import foxintheforest
+from foxy.tasks import next_ai_move, stop_pondering, AI_dict
+
+app = get_app()
 
 list_connected = []
 
+MAX_PLAYER_GAMES = 256
+"""Number of player views of games kept in memory"""
+player_games: OrderedDict[Tuple[int, int], foxintheforest.PlayerGame] = OrderedDict()
+
 def authenticated_only(func: Callable) -> Callable:
     """Decorator to disconnect if user is not authenticated for socketio.on() functions"""
     def wrapper(*args, **kwargs) -> Union[Callable, None]:
@@ -45,14 +53,28 @@ def flash_io(text: str, category: str = "info") -> None:
     """Send "message" to the client with the given category"""
     emit('message', json.dumps({"text": text, "category": category}))
 
+def get_player_game(game_id: int, game_state: foxintheforest.Game,
+                    player: int) -> foxintheforest.Game:
+    """Returns the view of the game by the player, updating the cached view if any"""
+    key = (game_id, player)
+    player_game = player_games.get(key)
+    if player_game is None or len(player_game.game["plays"]) > len(game_state["plays"]):
+        player_game = foxintheforest.PlayerGame(game_state, player)
+        player_games[key] = player_game
+        if len(player_games) > MAX_PLAYER_GAMES:
+            player_games.popitem(last=False)
+    else:
+        player_games.move_to_end(key)
+        player_game.update(game_state)
+    return player_game.game
+
 def create_new_game(match_id, first_player=-1):
     """Create a new game in the database"""
     new_game = foxintheforest.new_game()
     if first_player not in [0, 1]:
         first_player = randint(0, 1)
     new_game["first_player"] = first_player
-    game_state = json.dumps(new_game)
-    return Games(game=game_state, match_id=match_id, status=1)
+    return Games(game=foxintheforest.encode_game(new_game), match_id=match_id, status=1)
 
 @app.route("/")
 @app.route("/home")
@@ -215,19 +237,22 @@ def get_game(data):
     else:
         flash_io(_('You are not a player in this game.'), 'danger')
         return
-    game_state = json.loads(game_data.game)
-    emit("game", (json.dumps(foxintheforest.get_player_game(game_state, player)),
+    game_state = foxintheforest.decode_game(game_data.game)
+    emit("game", (json.dumps(get_player_game(game_data.id, game_state, player)),
                   json.dumps([match_data.score_first_player, match_data.score_second_player])))
+    state = None
     if match_data.second_player:
         if match_data.second_player.username in AI_dict.keys() and not game_data.lock:
             state = foxintheforest.get_state_from_game(game_state)
             if state["current_player"] == 1 and game_data.status != 2 and not game_data.lock:
                 game_data.lock = True
                 db.session.commit()
+                stop_pondering(game_id)
                 redis_queue.enqueue(next_ai_move, match_data.second_player.username, game_id)
     if game_data.status == 2:
         if match_data.status != 2:
-            state = foxintheforest.get_state_from_game(json.loads(game_data.game))
+            if state is None:
+                state = foxintheforest.get_state_from_game(game_state)
             match_data.score_first_player += state["score"][0]
             match_data.score_second_player += state["score"][1]
             emit("game ended", json.dumps({"score": state["score"], "discards": state["discards"]}))
@@ -258,17 +283,16 @@ def play(data):
     elif (match_data.first_player_id == current_user.id \
       or match_data.second_player_id == current_user.id) \
       and (match_data.second_player_id is not None) and (game_data.status == 1):
-        game_state = json.loads(game_data.game)
-        state = foxintheforest.get_state_from_game(game_state)
-        if (match_data.first_player_id == current_user.id and state["current_player"] == 0) \
-        or (match_data.second_player_id == current_user.id and state["current_player"] == 1):
+        game_state = foxintheforest.GameState(foxintheforest.decode_game(game_data.game))
+        current_player = game_state.state["current_player"]
+        if (match_data.first_player_id == current_user.id and current_player == 0) \
+        or (match_data.second_player_id == current_user.id and current_player == 1):
             if req["play"][-1] in foxintheforest.COLORS and int(req["play"][:-1]) < 13:
                 card_played = foxintheforest.decode_card(req["play"])
-                game_state = foxintheforest.play(game_state, [player, card_played])
-                state = foxintheforest.get_state_from_game(game_state)
-                if len(state["discards"][0]) + len(state["discards"][1]) == 26:
+                game_state.play([player, card_played])
+                if game_state.is_finished():
                     game_data.status = 2
-                game_data.game = json.dumps(game_state)
+                game_data.game = foxintheforest.encode_game(game_state.game)
                 db.session.commit()
         emit("game changed", json.dumps({}), room=game_id)
     else:
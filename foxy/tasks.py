@@ -1,23 +1,89 @@
-from flask import json
+import json
+from time import time
 # from flask_socketio import emit
 
-from foxy import random_ai
-from foxy import good_ai
-from foxy.models import Games
-from foxy import foxintheforest, db
-from foxy.routes import socketio
+from foxy.engine import random_ai
+from foxy.engine import good_ai
+from foxy.engine import foxintheforest
+from foxy.engine.decision_cache import DecisionCache, RedisBackend
+from foxy.engine.opening_book import open_book
 
 AI_dict = {"TheBad": random_ai, "TheGood": good_ai}
 
+PONDER_PREFIX = "foxy:ponder:"
+"""Prefix of the Redis keys of the matches the AI may ponder, deleted to stop it"""
+
+PONDER_CHECK_INTERVAL = 0.1
+"""Minimum time between two checks of the pondering key of a match (seconds)"""
+
+def ponder_key(game_id):
+    """Returns the Redis key whose deletion stops the pondering of the match"""
+    return f"{PONDER_PREFIX}{game_id}"
+
+def stop_pondering(game_id):
+    """Stop the pondering of the match, before queueing its next AI move"""
+    from foxy.extensions import redis_server
+    redis_server.delete(ponder_key(game_id))
+
 def next_ai_move(ai_name, game_id):
+    # The web app is only needed to reach the database, AIs only need the engine
+    from foxy import get_app
+    from foxy.extensions import db, socketio, redis_queue, redis_server
+    from foxy.models import Games
+    stop_pondering(game_id)
+    app = get_app()
     game_data = Games.query.filter_by(match_id=game_id).order_by(Games.date_created.desc()).first()
-    game_state = json.loads(game_data.game)
-    ai_play = AI_dict[ai_name].ai_play(foxintheforest.get_player_game(game_state, 1))
-    game_state = foxintheforest.play(game_state, ai_play)
-    state = foxintheforest.get_state_from_game(game_state)
-    if len(state["discards"][0]) + len(state["discards"][1]) == 26:
+    game_state = foxintheforest.GameState(foxintheforest.decode_game(game_data.game))
+    if AI_dict[ai_name] is good_ai:
+        # Decisions are shared by all the workers through Redis, openings are read from the book
+        ai_play = good_ai.ai_play(foxintheforest.get_player_game(game_state.game, 1),
+                                  match_id=game_id, cache=DecisionCache(RedisBackend(redis_server)),
+                                  book=open_book(app.config.get("OPENING_BOOK")))
+    else:
+        ai_play = AI_dict[ai_name].ai_play(foxintheforest.get_player_game(game_state.game, 1),
+                                           match_id=game_id)
+    game_state.play(ai_play)
+    if game_state.is_finished():
         game_data.status = 2
-    game_data.game = json.dumps(game_state)
+    game_data.game = foxintheforest.encode_game(game_state.game)
     game_data.lock = False
     db.session.commit()
     socketio.emit("game changed", json.dumps({}), room=game_id)
+    if ((game_state.is_finished() or not game_state.state["hands"][1])
+            and hasattr(AI_dict[ai_name], "forget_match")):
+        # The AI has played its last card of the deal, its trees are of no more use
+        AI_dict[ai_name].forget_match(game_id)
+    # Think during the player's turn in a job of its own, until the player moves
+    if (app.config.get("AI_PONDERING", False) and not game_state.is_finished()
+            and game_state.state["current_player"] == 0 and hasattr(AI_dict[ai_name], "ponder")):
+        redis_server.set(ponder_key(game_id), 1, ex=int(good_ai.PONDER_DURATION) + 60)
+        redis_queue.enqueue(ponder_ai_move, ai_name, game_id)
+
+def ponder_ai_move(ai_name, game_id):
+    """Search during the player's turn, the search tree is kept in the process for the next
+    AI move, so this is only useful with a single SimpleWorker"""
+    from foxy import get_app
+    from foxy.extensions import redis_server
+    from foxy.models import Games
+    key = ponder_key(game_id)
+    if redis_server.get(key) is None:
+        return
+    get_app()
+    game_data = Games.query.filter_by(match_id=game_id).order_by(Games.date_created.desc()).first()
+    game_state = foxintheforest.GameState(foxintheforest.decode_game(game_data.game))
+    if not game_state.is_finished() and game_state.state["current_player"] == 0:
+        AI_dict[ai_name].ponder(foxintheforest.get_player_game(game_state.game, 1), game_id,
+                                stop=ponder_stop(redis_server, key))
+
+def ponder_stop(redis_server, key):
+    """Returns the stop() callback of the pondering, True once the key is deleted
+        the server is only asked every PONDER_CHECK_INTERVAL seconds, the search calling it
+        every few simulations"""
+    next_check = [0.0]
+    def stop():
+        now = time()
+        if now < next_check[0]:
+            return False
+        next_check[0] = now + PONDER_CHECK_INTERVAL
+        return redis_server.get(key) is None
+    return stop
@@ -0,0 +1,62 @@
+import unittest
+import random
+
+import numpy as np
+
+from foxy.engine import foxintheforest, batch
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        random.seed(1)
+        self.cstates = [foxintheforest.compact_state(
+            foxintheforest.get_state_from_game(foxintheforest.new_game())) for _ in range(50)]
+
+    def test_conversions(self):
+        games = batch.new_batch(self.cstates)
+        for game, cstate in enumerate(self.cstates):
+            self.assertEqual(batch.get_compact_state(games, game), cstate)
+
+    def test_trick_winner(self):
+        cards = np.arange(foxintheforest.NB_CARDS, dtype=np.int8)
+        for leading_player in range(2):
+            for trump_card in cards:
+                winners, leaders = batch.batch_trick_winner(
+                    np.full(len(cards)**2, leading_player, dtype=np.int8),
+                    np.repeat(cards, len(cards)), np.tile(cards, len(cards)),
+                    np.full(len(cards)**2, trump_card, dtype=np.int8))
+                for n, (card0, card1) in enumerate(zip(np.repeat(cards, len(cards)),
+                                                       np.tile(cards, len(cards)))):
+                    self.assertEqual((winners[n], leaders[n]), foxintheforest.compact_trick_winner(
+                        leading_player, int(card0), int(card1), int(trump_card)))
+
+    def test_do_step(self):
+        games = batch.new_batch(self.cstates)
+        rng = np.random.default_rng(1)
+        active = ~batch.is_finished(games)
+        while active.any():
+            allowed = batch.batch_allowed(games)
+            keys = rng.random(allowed.shape)
+            keys[~allowed] = -1
+            cards = keys.argmax(axis=1)
+            for game, cstate in enumerate(self.cstates):
+                if not active[game]:
+                    continue
+                self.assertEqual(sorted(step & 63 for step in
+                                        foxintheforest.compact_list_allowed(cstate)),
+                                 list(np.flatnonzero(allowed[game])))
+                foxintheforest.compact_do_step(cstate, cstate["current_player"] << 6
+                                               | int(cards[game]))
+            batch.batch_do_step(games, cards, active)
+            for game, cstate in enumerate(self.cstates):
+                self.assertEqual(batch.get_compact_state(games, game), cstate)
+            active = ~batch.is_finished(games)
+        self.assertEqual(batch.batch_get_score(games).tolist(),
+                         [foxintheforest.compact_get_score(cstate) for cstate in self.cstates])
+
+    def test_random_playout(self):
+        games = batch.repeat_batch(self.cstates[0], 200)
+        batch.batch_random_playout(games, np.random.default_rng(2))
+        self.assertTrue(batch.is_finished(games).all())
+        scores = batch.batch_get_score(games)
+        self.assertTrue((scores.sum(axis=1) > 0).all())
+        self.assertTrue((games["discards"].sum(axis=(1, 2)) == 26).all())
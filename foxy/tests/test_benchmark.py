@@ -0,0 +1,17 @@
+import unittest
+
+from foxy.engine import benchmark
+
+class TestBenchmark(unittest.TestCase):
+    def test_compare_results(self):
+        baseline = {"do_step": 1000., "playouts": 100., "removed": 10.}
+        self.assertEqual(benchmark.compare_results({"do_step": 900., "playouts": 200.}, baseline), [])
+        regressions = benchmark.compare_results({"do_step": 700., "playouts": 100.}, baseline)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("do_step"))
+        self.assertEqual(benchmark.compare_results({"do_step": 700.}, baseline, threshold=0.5), [])
+
+    def test_run_benchmarks(self):
+        results = benchmark.run_benchmarks(min_duration=0)
+        self.assertIn("playouts", results)
+        self.assertTrue(all(value > 0 for value in results.values()))
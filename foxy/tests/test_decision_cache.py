@@ -0,0 +1,131 @@
+import unittest
+import os
+import random
+import tempfile
+import time
+
+from foxy.engine import foxintheforest, good_ai
+from foxy.engine.decision_cache import (
+    DecisionCache, DictBackend, FileBackend, RedisBackend, information_set_key
+)
+from foxy.engine.symmetry import SUIT_PERMUTATIONS, canonical_game, permute_game, permute_play
+
+class FakeRedis():
+    """Commands of a Redis connection used by RedisBackend, without expiration"""
+    def __init__(self):
+        self.values = {}
+        self.sorted_sets = {}
+
+    def get(self, name):
+        return self.values.get(name)
+
+    def set(self, name, value, ex=None):
+        self.values[name] = value.encode()
+
+    def delete(self, *names):
+        for name in names:
+            self.values.pop(name, None)
+
+    def zadd(self, name, mapping):
+        self.sorted_sets.setdefault(name, {}).update(
+            {member.encode(): score for member, score in mapping.items()})
+
+    def zcard(self, name):
+        return len(self.sorted_sets.get(name, {}))
+
+    def zrange(self, name, start, end):
+        members = self.sorted_sets.get(name, {})
+        return sorted(members, key=lambda member: (members[member], member))[start:end + 1]
+
+    def zrem(self, name, *members):
+        for member in members:
+            self.sorted_sets[name].pop(member, None)
+
+class TestBackends(unittest.TestCase):
+    def check_backend(self, backend):
+        backend.set("a", "1", 100)
+        backend.set("b", "2", 100)
+        self.assertEqual(backend.get("a"), "1")
+        backend.set("c", "3", 100)
+        # b is the least recently used
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("c"), "3")
+        backend.set("a", "4", -1)
+        self.assertIsNone(backend.get("a"))
+        self.assertIsNone(backend.get("d"))
+
+    def test_dict_backend(self):
+        self.check_backend(DictBackend(max_entries=2))
+
+    def test_file_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "decisions.db")
+            backend = FileBackend(path, max_entries=2)
+            backend.set("x", "5", 100)
+            time.sleep(0.01)
+            self.check_backend(backend)
+            backend.connection.close()
+            backend = FileBackend(path, max_entries=2)
+            self.assertEqual(backend.get("c"), "3")
+            backend.connection.close()
+
+    def test_redis_backend(self):
+        connection = FakeRedis()
+        connection.set("job", "queued")
+        backend = RedisBackend(connection, max_entries=2)
+        backend.set("a", "1", 100)
+        backend.set("b", "2", 100)
+        self.assertEqual(backend.get("a"), "1")
+        backend.set("c", "3", 100)
+        # b is the least recently used, other keys of the server are left alone
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("c"), "3")
+        self.assertEqual(sorted(connection.values),
+                         ["foxy:decision:a", "foxy:decision:c", "job"])
+        self.assertEqual(connection.zcard("foxy:decision:index"), 2)
+
+class TestDecisionCache(unittest.TestCase):
+    def test_information_set_key(self):
+        random.seed(16)
+        game = foxintheforest.new_game()
+        other = foxintheforest.copy_game(game)
+        player = game["first_player"]
+        # Same hand of the player in another order, other cards dealt otherwise
+        other["init_hands"][player] = list(reversed(game["init_hands"][player]))
+        hidden = other["init_hands"][1 - player] + other["init_draw_deck"]
+        random.shuffle(hidden)
+        other["init_hands"][1 - player] = hidden[:13]
+        other["init_draw_deck"] = hidden[13:]
+        view = foxintheforest.get_player_game(game, player)
+        self.assertEqual(information_set_key(view, {"k": 1}),
+                         information_set_key(foxintheforest.get_player_game(other, player),
+                                             {"k": 1}))
+        self.assertNotEqual(information_set_key(view, {"k": 1}),
+                            information_set_key(view, {"k": 2}))
+        self.assertNotEqual(information_set_key(view, {"k": 1}), information_set_key(
+            foxintheforest.get_player_game(game, 1 - player), {"k": 1}))
+        # Views equivalent by suit relabelling share their key
+        for permutation in SUIT_PERMUTATIONS:
+            self.assertEqual(information_set_key(permute_game(view, permutation), {"k": 1}),
+                             information_set_key(view, {"k": 1}))
+
+    def test_cached_play(self):
+        random.seed(17)
+        game = foxintheforest.new_game()
+        view = foxintheforest.get_player_game(game, game["first_player"])
+        cache = DecisionCache(DictBackend())
+        step = good_ai.ai_play(view, None, 200, cache=cache)
+        self.assertEqual(len(cache.backend.entries), 1)
+        statistics = cache.get(next(iter(cache.backend.entries)))
+        # The cached plays are in the canonical suit relabelling
+        permutation = canonical_game(view)[1]
+        self.assertEqual(foxintheforest.int_to_play(good_ai.best_play(statistics)),
+                         permute_play(step, permutation))
+        self.assertLessEqual(sum(visits for visits, _ in statistics.values()), 200)
+        start = time.process_time()
+        self.assertEqual(good_ai.ai_play(view, None, 200, cache=cache), step)
+        for permutation in SUIT_PERMUTATIONS:
+            self.assertEqual(good_ai.ai_play(permute_game(view, permutation), None, 200,
+                                             cache=cache), permute_play(step, permutation))
+        self.assertLess(time.process_time() - start, 0.05)
+        self.assertEqual(len(cache.backend.entries), 1)
@@ -0,0 +1,72 @@
+import unittest
+import random
+
+import numpy as np
+
+from foxy.engine import foxintheforest, batch, determinization, good_ai
+
+class TestDeterminization(unittest.TestCase):
+    def setUp(self):
+        random.seed(5)
+        self.rng = np.random.default_rng(5)
+        self.views = []
+        for _ in range(10):
+            game_state = foxintheforest.GameState(foxintheforest.new_game())
+            while not game_state.is_finished():
+                player = game_state.state["current_player"]
+                view = foxintheforest.get_state_from_game(
+                    foxintheforest.get_player_game(game_state.game, player))
+                self.views.append((view, good_ai.aquire_knowledge(view)))
+                game_state.apply_play(random.choice(
+                    foxintheforest.list_allowed(game_state.state, player)))
+
+    def test_constraints(self):
+        """Determinizations deal each hidden card once and follow the knowledge"""
+        for view, knowledge in self.views:
+            opponent = 1 - view["current_player"]
+            hands, private_discards, decks = determinization.sample_hidden_masks(
+                knowledge, len(view["hands"][opponent]), len(view["private_discards"][opponent]),
+                20, self.rng)
+            hidden = knowledge["remaining"] | knowledge["draw_deck"] | knowledge["opponent_hand"]
+            for hand, private, deck in zip(hands, private_discards, decks):
+                self.assertEqual(hand.bit_count(), len(view["hands"][opponent]))
+                self.assertEqual(private.bit_count(), len(view["private_discards"][opponent]))
+                self.assertEqual(len(deck), len(view["draw_deck"]))
+                deck_mask = foxintheforest.cards_to_mask(
+                    [foxintheforest.int_to_card(card) for card in deck])
+                self.assertEqual(hand | private | deck_mask, hidden)
+                self.assertEqual(hand.bit_count() + private.bit_count() + len(deck),
+                                 hidden.bit_count())
+                self.assertEqual(hand & knowledge["opponent_hand"], knowledge["opponent_hand"])
+                self.assertEqual(hand & knowledge["draw_deck"], 0)
+                for suit_mask in foxintheforest.SUIT_MASKS:
+                    if knowledge["max_one"] & suit_mask:
+                        self.assertLessEqual(
+                            (hand & knowledge["remaining"] & suit_mask).bit_count(), 1)
+
+    def test_max_one_distribution(self):
+        """The opponent hands follow the distribution of random_hidden_cards"""
+        view, knowledge = next((view, knowledge) for view, knowledge in self.views
+                               if knowledge["remaining"] & knowledge["max_one"])
+        opponent = 1 - view["current_player"]
+        hands = determinization.sample_hidden_cards(
+            knowledge, len(view["hands"][opponent]), len(view["private_discards"][opponent]),
+            4000, self.rng)[0]
+        expected = np.zeros(foxintheforest.NB_CARDS)
+        for _ in range(4000):
+            hand = good_ai.random_hidden_cards(view, knowledge)[0]
+            expected += [hand >> card & 1 for card in range(foxintheforest.NB_CARDS)]
+        np.testing.assert_allclose(hands.mean(axis=0), expected / 4000, atol=0.05)
+
+    def test_determinize_batch(self):
+        view, knowledge = self.views[20]
+        cstate = foxintheforest.compact_state(good_ai.random_state(view, knowledge),
+                                              knowledge["special_type"])
+        games = determinization.determinize_batch(cstate, knowledge, 8, self.rng)
+        for game in range(8):
+            sample = batch.get_compact_state(games, game)
+            self.assertEqual(sample["hands"][view["current_player"]],
+                             cstate["hands"][view["current_player"]])
+            self.assertEqual(len(sample["draw_deck"]), len(cstate["draw_deck"]))
+        batch.batch_random_playout(games, self.rng)
+        self.assertTrue(batch.is_finished(games).all())
@@ -1,7 +1,8 @@
 import unittest
 import random
+import json
 
-from foxy import foxintheforest
+from foxy.engine import foxintheforest
 
 class TestBasicFunctions(unittest.TestCase):
     def test_other_player(self):
@@ -22,6 +23,18 @@ class TestBasicFunctions(unittest.TestCase):
         self.assertTupleEqual(foxintheforest.trick_winner(0, [[9, "s"], [11, "s"]], [1, "s"]), (1, 1))
         self.assertTupleEqual(foxintheforest.trick_winner(0, [[9, "c"], [9, "h"]], [1, "s"]), (0, 0))
     
+    def test_trick_winner_table(self):
+        for leading_player in range(2):
+            for trump_card in foxintheforest.CARDS:
+                for card0 in foxintheforest.CARDS:
+                    for card1 in foxintheforest.CARDS:
+                        self.assertTupleEqual(
+                            foxintheforest.compact_trick_winner(
+                                leading_player, foxintheforest.card_to_int(card0),
+                                foxintheforest.card_to_int(card1),
+                                foxintheforest.card_to_int(trump_card)),
+                            foxintheforest.trick_winner(leading_player, [card0, card1], trump_card))
+
     def test_decode_card(self):
         self.assertEqual(foxintheforest.decode_card("1s"), [1, "s"])
         self.assertEqual(foxintheforest.decode_card("10s"), [10, "s"])
@@ -288,6 +301,45 @@ class TestStatePlay(unittest.TestCase):
         self.assertEqual(foxintheforest.list_allowed(self.state, 1), [])
         self.assertEqual(foxintheforest.list_allowed(self.state, 0), [[0, [9, 'c']], [0, [6, 'c']], [0, [1, 'c']]])
 
+    def test_list_allowed_no_card_of_suit(self):
+        for step in [[1, [2, 'c']], [0, [1, 'c']], [0, [8, 'h']], [1, [7, 'h']], [0, [6, 'h']],
+                     [1, [1, 'h']], [1, [4, 'c']], [0, [6, 'c']], [0, [2, 'h']]]:
+            foxintheforest.play(self.game, step)
+        self.state = foxintheforest.get_state_from_game(self.game)
+        self.assertEqual(len(self.state["plays"]), 9)
+        self.assertEqual(foxintheforest.list_allowed(self.state, 1), [[1, [1, 's']], [1, [10, 'c']],
+            [1, [5, 'c']], [1, [9, 's']], [1, [3, 's']], [1, [8, 'c']], [1, [2, 's']],
+            [1, [10, 's']], [1, [7, 'c']]])
+
+    def test_list_allowed_card11(self):
+        foxintheforest.play(self.game, [1, [2, 'c']])
+        foxintheforest.play(self.game, [0, [1, 'c']])
+        foxintheforest.play(self.game, [0, [11, 's']])
+        self.state = foxintheforest.get_state_from_game(self.game)
+        self.assertEqual(foxintheforest.list_allowed(self.state, 1), [[1, [1, 's']], [1, [10, 's']]])
+
+    def test_list_allowed_is_valid_step(self):
+        random.seed(7)
+        for _ in range(20):
+            game = foxintheforest.new_game()
+            state = foxintheforest.get_state_from_game(game)
+            while state["hands"][0] or state["hands"][1]:
+                for player in range(2):
+                    allowed = foxintheforest.list_allowed(state, player)
+                    for card in foxintheforest.CARDS:
+                        self.assertEqual(foxintheforest.valid_step(state, [player, card]),
+                                         [player, card] in allowed)
+                # Same plays as the mask-based generator of the compact engine
+                state, special_type = foxintheforest._replay_game(game)
+                self.assertEqual(
+                    sorted(foxintheforest.play_to_int(step) for step in
+                           foxintheforest.list_allowed(state, state["current_player"])),
+                    foxintheforest.compact_list_allowed(
+                        foxintheforest.compact_state(state, special_type)))
+                foxintheforest.apply_play(game, random.choice(
+                    foxintheforest.list_allowed(state, state["current_player"])))
+                state = foxintheforest.get_state_from_game(game)
+
 class TestScore(unittest.TestCase):
     def test_score(self):
         random.seed(1)
@@ -301,7 +353,7 @@ class TestScore(unittest.TestCase):
                 selected_play = sorted(foxintheforest.list_allowed(self.state, 1))[0]
             foxintheforest.play(self.game, selected_play)
             self.state = foxintheforest.get_state_from_game(self.game)
-        self.assertEqual(foxintheforest.get_score(self.state), [8, 2])
+        self.assertEqual(foxintheforest.get_score(self.state), [8, 4])
         
         random.seed(21)
         self.game = foxintheforest.new_game()
@@ -315,3 +367,133 @@ class TestScore(unittest.TestCase):
             foxintheforest.play(self.game, selected_play)
             self.state = foxintheforest.get_state_from_game(self.game)
         self.assertEqual(foxintheforest.get_score(self.state), [7, 3])
+
+class TestCompactState(unittest.TestCase):
+    def test_card_conversions(self):
+        for n, card in enumerate(foxintheforest.CARDS):
+            self.assertEqual(foxintheforest.card_to_int(card), n)
+            self.assertEqual(foxintheforest.int_to_card(n), card)
+        self.assertEqual(foxintheforest.int_to_play(foxintheforest.play_to_int([1, [7, 'h']])),
+                         [1, [7, 'h']])
+        mask = foxintheforest.cards_to_mask([[11, 'c'], [1, 'h'], [None, None]])
+        self.assertEqual(mask, 1 << 32 | 1)
+        self.assertEqual(foxintheforest.mask_to_cards(mask), [[1, 'h'], [11, 'c']])
+
+    def test_compact_do_step(self):
+        random.seed(3)
+        for _ in range(20):
+            game = foxintheforest.new_game()
+            state = foxintheforest.get_state_from_game(game)
+            cstate = foxintheforest.compact_state(state)
+            special_type = None
+            while cstate["hands"][0] or cstate["hands"][1]:
+                player = state["current_player"]
+                allowed = foxintheforest.compact_list_allowed(cstate)
+                valid = [foxintheforest.play_to_int([player, card]) for card in state["hands"][player]
+                         if foxintheforest.valid_step(state, [player, card])]
+                self.assertEqual(sorted(allowed), sorted(valid))
+                step = random.choice(allowed)
+                state, special_type = foxintheforest.do_step(state, foxintheforest.int_to_play(step),
+                                                             special_type)
+                foxintheforest.compact_do_step(cstate, step)
+                self.assertEqual(cstate, foxintheforest.compact_state(state, special_type))
+            self.assertEqual(foxintheforest.compact_get_score(cstate), foxintheforest.get_score(state))
+
+    def test_compact_undo_step(self):
+        random.seed(4)
+        for _ in range(20):
+            cstate = foxintheforest.compact_state(
+                foxintheforest.get_state_from_game(foxintheforest.new_game()))
+            cstate["hash"] = foxintheforest.zobrist_hash(cstate)
+            initial = dict(foxintheforest.copy_compact_state(cstate), hash=cstate["hash"])
+            undos = []
+            while cstate["hands"][0] or cstate["hands"][1]:
+                before = dict(foxintheforest.copy_compact_state(cstate), hash=cstate["hash"])
+                step = random.choice(foxintheforest.compact_list_allowed(cstate))
+                after = foxintheforest.copy_compact_state(cstate)
+                foxintheforest.compact_do_step(after, step)
+                after["hash"] = foxintheforest.zobrist_hash(after)
+                foxintheforest.compact_undo_step(cstate, foxintheforest.compact_make_step(cstate, step))
+                self.assertEqual(cstate, before)
+                undos.append(foxintheforest.compact_make_step(cstate, step))
+                self.assertEqual(cstate, after)
+            while undos:
+                foxintheforest.compact_undo_step(cstate, undos.pop())
+            self.assertEqual(cstate, initial)
+
+    def test_zobrist_hash(self):
+        random.seed(6)
+        hashes = set()
+        for _ in range(20):
+            cstate = foxintheforest.compact_state(
+                foxintheforest.get_state_from_game(foxintheforest.new_game()))
+            cstate["hash"] = foxintheforest.zobrist_hash(cstate)
+            while cstate["hands"][0] or cstate["hands"][1]:
+                foxintheforest.compact_make_step(cstate, random.choice(
+                    foxintheforest.compact_list_allowed(cstate)))
+                self.assertEqual(cstate["hash"], foxintheforest.zobrist_hash(cstate))
+                hashes.add(cstate["hash"])
+        self.assertGreater(len(hashes), 20 * 20)
+        # Won cards only matter through the tricks and 7s won
+        same = foxintheforest.copy_compact_state(cstate)
+        seven, other = foxintheforest.card_to_int([7, 'h']), foxintheforest.card_to_int([7, 's'])
+        same["discards"] = [1 << seven | 1 << 1, 1 << other | 1 << 2]
+        swapped = foxintheforest.copy_compact_state(same)
+        swapped["discards"] = [1 << other | 1 << 2, 1 << seven | 1 << 1]
+        self.assertEqual(foxintheforest.zobrist_hash(same), foxintheforest.zobrist_hash(swapped))
+
+class TestGameStateObject(unittest.TestCase):
+    def test_incremental_state(self):
+        random.seed(5)
+        game = foxintheforest.new_game()
+        game_state = foxintheforest.GameState(foxintheforest.copy_game(game))
+        self.assertFalse(game_state.play([foxintheforest.other_player(game["first_player"]),
+                                          game["init_hands"][0][0]]))
+        while not game_state.is_finished():
+            step = random.choice(foxintheforest.list_allowed(game_state.state,
+                                                             game_state.state["current_player"]))
+            self.assertTrue(game_state.play(step))
+            foxintheforest.play(game, step)
+            self.assertEqual(game_state.game, game)
+            self.assertEqual(game_state.state, foxintheforest.get_state_from_game(game))
+        rebuilt = foxintheforest.GameState(game)
+        self.assertEqual(rebuilt.state, game_state.state)
+        self.assertNotEqual(rebuilt.state["score"], [0, 0])
+
+
+class TestPlayerGameObject(unittest.TestCase):
+    def test_update(self):
+        random.seed(6)
+        for _ in range(10):
+            game = foxintheforest.new_game()
+            full_game = foxintheforest.copy_game(game)
+            game_state = foxintheforest.GameState(full_game)
+            while not game_state.is_finished():
+                game_state.play(random.choice(foxintheforest.list_allowed(
+                    game_state.state, game_state.state["current_player"])))
+            views = [foxintheforest.PlayerGame(game, 0), foxintheforest.PlayerGame(game, 1)]
+            for step in full_game["plays"]:
+                foxintheforest.apply_play(game, step)
+                for player in range(2):
+                    self.assertEqual(views[player].update(game),
+                                     foxintheforest.get_player_game(game, player))
+
+class TestGameEncoding(unittest.TestCase):
+    def setUp(self):
+        random.seed(1)
+        self.game = foxintheforest.new_game()
+        for step in [[1, [1, 's']], [0, [6, 's']], [1, [8, 'c']], [0, [6, 'c']], [1, [5, 'c']],
+                     [1, [10, 'c']], [0, [1, 'c']], [0, [3, 'h']], [0, [11, 'h']], [1, [1, 'h']]]:
+            foxintheforest.play(self.game, step)
+
+    def test_encode_game(self):
+        data = foxintheforest.encode_game(self.game)
+        self.assertEqual(len(data), 2 + 33 + 10)
+        self.assertEqual(data[0], foxintheforest.GAME_FORMAT_VERSION)
+        self.assertEqual(foxintheforest.decode_game(data), self.game)
+
+    def test_decode_json_game(self):
+        self.assertEqual(foxintheforest.decode_game(json.dumps(self.game)), self.game)
+        self.assertEqual(foxintheforest.decode_game(json.dumps(self.game).encode()), self.game)
+        with self.assertRaises(ValueError):
+            foxintheforest.decode_game(b"\x00" + foxintheforest.encode_game(self.game)[1:])
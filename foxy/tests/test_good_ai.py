@@ -0,0 +1,307 @@
+import unittest
+import random
+import time
+
+import numpy as np
+
+from foxy.engine import foxintheforest, good_ai
+
+class TestKnowledge(unittest.TestCase):
+    def test_random_state(self):
+        """Random states must deal each card once, with the real number of hidden cards"""
+        random.seed(7)
+        for _ in range(30):
+            game_state = foxintheforest.GameState(foxintheforest.new_game())
+            while not game_state.is_finished():
+                full = game_state.state
+                player = full["current_player"]
+                view = foxintheforest.get_state_from_game(
+                    foxintheforest.get_player_game(game_state.game, player))
+                knowledge = good_ai.aquire_knowledge(view)
+                rand_state = good_ai.random_state(view, knowledge)
+                cards = (rand_state["hands"][0] + rand_state["hands"][1]
+                         + rand_state["discards"][0] + rand_state["discards"][1]
+                         + rand_state["private_discards"][0] + rand_state["private_discards"][1]
+                         + rand_state["draw_deck"]
+                         + [card for card in rand_state["trick"] if card and card[0]]
+                         + ([rand_state["trump_card"]] if rand_state["trump_card"] else []))
+                self.assertCountEqual(cards, foxintheforest.CARDS)
+                self.assertEqual(len(rand_state["hands"][1 - player]),
+                                 len(full["hands"][1 - player]))
+                self.assertEqual(len(rand_state["draw_deck"]), len(full["draw_deck"]))
+                game_state.apply_play(random.choice(foxintheforest.list_allowed(full, player)))
+
+    def test_match_knowledge(self):
+        """Knowledge updated turn after turn must be the knowledge acquired from all plays"""
+        random.seed(9)
+        masks = ("remaining", "draw_deck", "opponent_hand", "max_one", "special_type")
+        for _ in range(10):
+            game_state = foxintheforest.GameState(foxintheforest.new_game())
+            while not game_state.is_finished():
+                player = game_state.state["current_player"]
+                view = foxintheforest.get_state_from_game(
+                    foxintheforest.get_player_game(game_state.game, player))
+                knowledge = good_ai.match_knowledge(("match", player), view)
+                expected = good_ai.aquire_knowledge(view)
+                self.assertEqual([knowledge[key] for key in masks],
+                                 [expected[key] for key in masks])
+                game_state.apply_play(random.choice(
+                    foxintheforest.list_allowed(game_state.state, player)))
+            good_ai.knowledges.clear()
+        # Knowledge of another game is not reused
+        new_view = foxintheforest.get_state_from_game(foxintheforest.new_game())
+        key = ("match", new_view["current_player"])
+        good_ai.knowledges[key] = good_ai.aquire_knowledge(view)
+        good_ai.knowledges[key]["player"] = new_view["current_player"]
+        self.assertEqual(good_ai.match_knowledge(key, new_view)["nb_plays"], 0)
+        good_ai.knowledges.clear()
+
+    def test_max_one_after_five(self):
+        """A card of a suit the opponent did not have, known in its hand, is not counted in
+        the one card of the suit it may have drawn with a 5"""
+        knowledge = good_ai.new_knowledge(0, [7, "c"])
+        for play in ([0, [2, "c"]], [1, [4, "h"]],  # The opponent cuts clubs
+                     [1, [3, "h"]], [1, [9, "h"]], [0, [6, "h"]]):  # and takes the 7 of clubs
+            good_ai._learn_from_play(knowledge, play)
+        clubs = foxintheforest.SUIT_MASKS[2]
+        self.assertEqual(knowledge["opponent_hand"], 1 << foxintheforest.card_to_int([7, "c"]))
+        good_ai._learn_from_play(knowledge, [1, [5, "h"]])
+        good_ai._learn_from_play(knowledge, [1, [None, None]])
+        # It may have kept the 7 and drawn another club
+        self.assertFalse(knowledge["max_one"] & clubs)
+
+    def test_trump_taken_with_three(self):
+        """The trump card taken by the opponent with a 3 is dealt once, in its hand"""
+        random.seed(15)
+        found = 0
+        while found < 5:
+            game_state = foxintheforest.GameState(foxintheforest.new_game())
+            while not game_state.is_finished():
+                full = game_state.state
+                player = full["current_player"]
+                plays = full["plays"]
+                # The opponent played a 3 (not discarded it after a 5) then its discard
+                if (len(plays) > 2 and plays[-2][0] != player and plays[-2][1][0] == 3
+                        and plays[-1][0] != player
+                        and (plays[-3][0] == player or plays[-3][1][0] != 5)):
+                    taken = foxintheforest.get_state_from_game(
+                        dict(game_state.game, plays=plays[:-2]))["trump_card"]
+                    found += taken != plays[-1][1]
+                    view = foxintheforest.get_state_from_game(
+                        foxintheforest.get_player_game(game_state.game, player))
+                    knowledge = good_ai.aquire_knowledge(view)
+                    for _ in range(10 if taken != plays[-1][1] else 0):
+                        rand_state = good_ai.random_state(view, knowledge)
+                        self.assertIn(taken, rand_state["hands"][1 - player])
+                        self.assertNotIn(taken, rand_state["draw_deck"])
+                        self.assertNotIn(taken, rand_state["private_discards"][1 - player])
+                game_state.apply_play(random.choice(foxintheforest.list_allowed(full, player)))
+
+    def test_ai_play(self):
+        random.seed(8)
+        game_state = foxintheforest.GameState(foxintheforest.new_game())
+        while not game_state.is_finished():
+            player = game_state.state["current_player"]
+            step = good_ai.ai_play(foxintheforest.get_player_game(game_state.game, player), 0, 5)
+            self.assertTrue(game_state.play(step))
+
+class TestSelect(unittest.TestCase):
+    def test_zero_values(self):
+        """A child is selected when every upper confidence bound is 0"""
+        random.seed(19)
+        cstate = foxintheforest.compact_state(
+            foxintheforest.get_state_from_game(foxintheforest.new_game()))
+        tree = good_ai.Tree()
+        for play in foxintheforest.compact_list_allowed(cstate):
+            tree.visits[tree.add_child(0, play)] = 1
+        self.assertIn(good_ai.select(tree, 0, cstate, 0), tree.get_children(0))
+
+class TestParallelSearch(unittest.TestCase):
+    def test_merge_root_statistics(self):
+        merged = good_ai.merge_root_statistics([{1: (3, 1.5), 2: (1, 0.5)},
+                                                {1: (2, 1.0), 3: (4, 2.0)}])
+        self.assertEqual(merged, {1: (5, 2.5), 2: (1, 0.5), 3: (4, 2.0)})
+
+    def test_parallel_ai_play(self):
+        random.seed(9)
+        game_state = foxintheforest.GameState(foxintheforest.new_game())
+        for _ in range(3):
+            player = game_state.state["current_player"]
+            step = good_ai.ai_play(foxintheforest.get_player_game(game_state.game, player),
+                                   0, 5, workers=2)
+            self.assertTrue(game_state.play(step))
+        processes = good_ai.pools[2]._pool
+        good_ai.close_pools()
+        self.assertEqual(good_ai.pools, {})
+        self.assertFalse(any(process.is_alive() for process in processes))
+
+class TestTreeReuse(unittest.TestCase):
+    def tearDown(self):
+        good_ai.trees.clear()
+        good_ai.knowledges.clear()
+
+    def test_reuse_tree(self):
+        random.seed(10)
+        game_state = foxintheforest.GameState(foxintheforest.new_game())
+        player = game_state.state["current_player"]
+        view = foxintheforest.PlayerGame(game_state.game, player)
+        step = good_ai.ai_play(view.game, None, 500, match_id="match")
+        self.assertIn(("match", player), good_ai.trees)
+        _, tree = good_ai.trees[("match", player)]
+        game_state.play(step)
+        expected = tree.children[foxintheforest.card_to_int(step[1])]
+        while game_state.state["current_player"] != player:
+            # Opponent plays its most explored allowed card, a 5 being last as its discard is secret
+            allowed = [foxintheforest.play_to_int(play) for play in foxintheforest.list_allowed(
+                game_state.state, game_state.state["current_player"])]
+            expected = max((child for child in tree.get_children(expected)
+                            if tree.plays[child] in allowed),
+                           key=lambda child: (
+                               foxintheforest.CARD_VALUES[tree.plays[child] & 63] != 5,
+                               tree.visits[child]))
+            game_state.play(foxintheforest.int_to_play(tree.plays[expected]))
+        view.update(game_state.game)
+        subtree = good_ai.reuse_tree(("match", player), view.game)
+        self.assertEqual(subtree.visits[0], tree.visits[expected])
+        self.assertEqual(len(subtree.get_children(0)), len(tree.get_children(expected)))
+        self.assertGreater(subtree.visits[0], 0)
+        self.assertNotIn(("match", player), good_ai.trees)
+        # A tree that does not apply is not reused
+        good_ai.keep_tree(("match", player), view.game, subtree)
+        self.assertEqual(len(good_ai.reuse_tree(("match", player), {"plays": []})), 1)
+
+    def test_reuse_tree_allowed(self):
+        """Children of the root for cards the player does not hold are dropped"""
+        tree = good_ai.Tree()
+        for card, visits in ((2, 5), (13, 3), (30, 4)):
+            child = tree.add_child(0, card)
+            tree.visits[child] = visits
+            tree.add_child(child, 1 << 6 | 1)
+        tree.visits[0] = 12
+        good_ai.keep_tree(("match", 0), {"plays": []}, tree)
+        subtree = good_ai.reuse_tree(("match", 0), {"plays": []}, {2, 30, 31})
+        self.assertEqual(sorted(subtree.plays[child] for child in subtree.get_children(0)),
+                         [2, 30])
+        self.assertEqual(subtree.visits[0], 9)
+        self.assertEqual(len(subtree), 5)
+        good_ai.keep_tree(("match", 0), {"plays": []}, subtree)
+        self.assertIs(good_ai.reuse_tree(("match", 0), {"plays": []}, {2, 30}), subtree)
+
+    def test_keep_tree(self):
+        game = {"plays": []}
+        for match in range(good_ai.MAX_TREES + 3):
+            good_ai.keep_tree((match, 0), game, good_ai.Tree())
+        self.assertEqual(len(good_ai.trees), good_ai.MAX_TREES)
+        self.assertNotIn((0, 0), good_ai.trees)
+        self.assertIn((good_ai.MAX_TREES + 2, 0), good_ai.trees)
+
+    def test_kept_nodes(self):
+        game = {"plays": []}
+        tree = good_ai.Tree()
+        for node in range(good_ai.MAX_KEPT_NODES // 4):
+            tree.add_child(node // foxintheforest.NB_CARDS, node % foxintheforest.NB_CARDS)
+        for match in range(5):
+            good_ai.keep_tree((match, 0), game, tree)
+        # A quarter of the nodes and the root in each tree, only 3 trees fit
+        self.assertEqual(list(good_ai.trees), [(2, 0), (3, 0), (4, 0)])
+
+    def test_forget_match(self):
+        random.seed(14)
+        game = foxintheforest.new_game()
+        view = foxintheforest.get_player_game(game, game["first_player"])
+        for match in ("match", "other"):
+            good_ai.ai_play(view, None, 50, match_id=match)
+        good_ai.forget_match("match")
+        self.assertEqual(list(good_ai.trees), [("other", game["first_player"])])
+        self.assertEqual(list(good_ai.knowledges), [("other", game["first_player"])])
+
+class TestAnytimeSearch(unittest.TestCase):
+    def setUp(self):
+        random.seed(11)
+        self.state = foxintheforest.get_state_from_game(foxintheforest.new_game())
+        self.knowledge = good_ai.aquire_knowledge(self.state)
+
+    def test_budget(self):
+        tree = good_ai.Tree()
+        good_ai.search(self.state, self.knowledge, tree, None, 100)
+        self.assertLessEqual(tree.visits[0], 100)
+        self.assertGreater(tree.visits[0], 1)
+
+    def test_deadline(self):
+        tree = good_ai.Tree()
+        good_ai.search(self.state, self.knowledge, tree, time.time() - 1, None)
+        self.assertLessEqual(tree.visits[0], 2 * good_ai.CHECK_INTERVAL)
+
+    def test_full_tree(self):
+        """The search stops when the root cannot be expanded"""
+        self.assertEqual(good_ai.search(self.state, self.knowledge, good_ai.Tree(max_nodes=1),
+                                        None, None), good_ai.NO_NODE)
+
+    def test_forced_play(self):
+        game_state = foxintheforest.GameState(foxintheforest.new_game())
+        while len(foxintheforest.list_allowed(game_state.state,
+                                              game_state.state["current_player"])) != 1:
+            game_state.play(random.choice(foxintheforest.list_allowed(
+                game_state.state, game_state.state["current_player"])))
+        player = game_state.state["current_player"]
+        start = time.time()
+        step = good_ai.ai_play(foxintheforest.get_player_game(game_state.game, player), 10)
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual([step], foxintheforest.list_allowed(game_state.state, player))
+
+class TestLeafParallel(unittest.TestCase):
+    def test_batch_reward(self):
+        random.seed(12)
+        cstate = foxintheforest.compact_state(
+            foxintheforest.get_state_from_game(foxintheforest.new_game()))
+        rng = np.random.default_rng(12)
+        reward = good_ai.batch_reward(cstate, 0, 16, rng)
+        self.assertTrue(0 < reward < 1)
+        self.assertAlmostEqual(good_ai.batch_reward(cstate, 1, 16, np.random.default_rng(12)),
+                               1 - good_ai.batch_reward(cstate, 0, 16, np.random.default_rng(12)))
+
+    def test_ai_play(self):
+        random.seed(13)
+        game_state = foxintheforest.GameState(foxintheforest.new_game())
+        while not game_state.is_finished():
+            player = game_state.state["current_player"]
+            step = good_ai.ai_play(foxintheforest.get_player_game(game_state.game, player),
+                                   None, 5, playouts=8)
+            self.assertTrue(game_state.play(step))
+
+class TestPondering(unittest.TestCase):
+    def tearDown(self):
+        good_ai.trees.clear()
+        good_ai.knowledges.clear()
+
+    def test_ponder(self):
+        random.seed(14)
+        game_state = foxintheforest.GameState(foxintheforest.new_game())
+        player = game_state.state["current_player"]
+        view = foxintheforest.PlayerGame(game_state.game, player)
+        while game_state.state["current_player"] == player:
+            game_state.play(good_ai.ai_play(view.update(game_state.game), None, 50,
+                                            match_id="match"))
+        good_ai.ponder(view.update(game_state.game), "match", duration=0.2)
+        nb_plays, tree = good_ai.trees[("match", player)]
+        self.assertEqual(nb_plays, len(game_state.game["plays"]))
+        self.assertGreater(tree.visits[0], 50)
+        # The search goes on from the subtree of the opponent play
+        opponent_play = max(tree.get_children(0), key=lambda child: tree.visits[child])
+        game_state.play(foxintheforest.int_to_play(tree.plays[opponent_play]))
+        if game_state.state["current_player"] == player:
+            subtree = good_ai.reuse_tree(("match", player), view.update(game_state.game))
+            self.assertEqual(subtree.visits[0], tree.visits[opponent_play])
+
+    def test_stop(self):
+        random.seed(15)
+        game = foxintheforest.new_game()
+        view = foxintheforest.get_player_game(game, 1 - game["first_player"])
+        start = time.time()
+        good_ai.ponder(view, "match", stop=lambda: True, duration=10)
+        self.assertLess(time.time() - start, 5)
+        self.assertIn(("match", 1 - game["first_player"]), good_ai.trees)
+        # Nothing to do on the player's own turn
+        good_ai.trees.clear()
+        good_ai.ponder(foxintheforest.get_player_game(game, game["first_player"]), "match")
+        self.assertEqual(len(good_ai.trees), 0)
@@ -0,0 +1,90 @@
+import unittest
+import os
+import random
+import tempfile
+
+from foxy.engine import foxintheforest, good_ai
+from foxy.engine.build_opening_book import opening_positions
+from foxy.engine.opening_book import (
+    OpeningBook, abstract_play, concrete_card, opening_key, opening_position, read_book,
+    write_book
+)
+from foxy.engine.symmetry import SUIT_PERMUTATIONS, permute_game, permute_play
+
+class TestOpeningBook(unittest.TestCase):
+    def test_opening_key(self):
+        positions = opening_positions(20, seed=3)
+        keys = [opening_key(game) for game in positions]
+        self.assertNotIn(None, keys)
+        # Positions equivalent by suit relabelling share their key
+        for game in positions:
+            for permutation in SUIT_PERMUTATIONS:
+                self.assertEqual(opening_key(permute_game(game, permutation)),
+                                 opening_key(game))
+        random.seed(4)
+        game = foxintheforest.new_game()
+        leader = game["first_player"]
+        view = foxintheforest.get_player_game(game, leader)
+        # The order of the cards in the hand does not matter
+        view["init_hands"][leader].reverse()
+        self.assertEqual(opening_key(view),
+                         opening_key(foxintheforest.get_player_game(game, leader)))
+        # Only the first decision of the player is in the book
+        self.assertIsNone(opening_key(foxintheforest.get_player_game(game, 1 - leader)))
+        state = foxintheforest.get_state_from_game(game)
+        foxintheforest.apply_play(game, foxintheforest.list_allowed(state, leader)[0])
+        self.assertIsNone(opening_key(foxintheforest.get_player_game(game, leader)))
+
+    def test_abstraction(self):
+        """Hands with the same number of cards, 11 and 1 in each suit share their key"""
+        game = {"plays": [], "first_player": 0, "player": 0, "init_trump_card": [4, "c"],
+                "init_hands": [[[11, "h"], [6, "h"], [2, "h"], [1, "s"], [3, "s"], [9, "s"],
+                                [10, "s"], [5, "c"], [7, "c"], [8, "c"], [2, "c"], [3, "c"],
+                                [6, "c"]], []]}
+        other = dict(game, init_hands=[[[11, "h"], [4, "h"], [8, "h"]] + game["init_hands"][0][3:],
+                                       []])
+        self.assertEqual(opening_key(other), opening_key(game))
+        self.assertNotEqual(opening_key(dict(game, init_trump_card=[4, "h"])),
+                            opening_key(game))
+        key, suits = opening_position(game)
+        self.assertEqual(suits[0], foxintheforest.COLORS.index("c"))
+        for card in game["init_hands"][0]:
+            play = abstract_play(game, suits, foxintheforest.card_to_int(card))
+            self.assertEqual(foxintheforest.int_to_card(concrete_card(game, suits, play)), card)
+            # The same abstract play is the card of the same rank in the other hand
+            self.assertIn(foxintheforest.int_to_card(concrete_card(other, suits, play)),
+                          other["init_hands"][0])
+
+    def test_book_file(self):
+        entries = {random.getrandbits(24): random.randrange(48) for _ in range(100)}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "book.bin")
+            write_book(path, entries)
+            book = OpeningBook(path)
+            self.assertEqual(len(book), 100)
+            self.assertEqual(read_book(path), entries)
+            for key, play in entries.items():
+                self.assertEqual(book.get(key), play)
+            self.assertIsNone(book.get(max(entries) + 1))
+            write_book(path, {})
+            self.assertEqual(len(OpeningBook(path)), 0)
+
+    def test_book_play(self):
+        random.seed(6)
+        game = foxintheforest.new_game()
+        leader = game["first_player"]
+        view = foxintheforest.get_player_game(game, leader)
+        state = foxintheforest.get_state_from_game(view)
+        # The book play is returned without searching, even a poor one
+        play = foxintheforest.list_allowed(state, leader)[-1]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "book.bin")
+            key, suits = opening_position(view)
+            write_book(path, {key: abstract_play(view, suits,
+                                                 foxintheforest.card_to_int(play[1]))})
+            book = OpeningBook(path)
+            self.assertEqual(book.lookup(view), play)
+            self.assertEqual(good_ai.ai_play(view, None, None, book=book), play)
+            for permutation in SUIT_PERMUTATIONS:
+                self.assertEqual(book.lookup(permute_game(view, permutation)),
+                                 permute_play(play, permutation))
@@ -0,0 +1,15 @@
+import unittest
+import random
+
+from foxy.engine import foxintheforest, random_ai
+
+class TestRandomAI(unittest.TestCase):
+    def test_ai_play(self):
+        """Both players get a play of their own"""
+        random.seed(18)
+        game_state = foxintheforest.GameState(foxintheforest.new_game())
+        while not game_state.is_finished():
+            player = game_state.state["current_player"]
+            step = random_ai.ai_play(foxintheforest.get_player_game(game_state.game, player))
+            self.assertEqual(step[0], player)
+            self.assertTrue(game_state.play(step))
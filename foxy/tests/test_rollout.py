@@ -0,0 +1,53 @@
+import unittest
+import random
+
+from foxy.engine import foxintheforest, rollout
+
+def compact_deal(hands, trump_card, first_player, plays=()):
+    """Returns the compact state of a deal with the given hands, trump card and plays"""
+    game = {"plays": [list(play) for play in plays], "first_player": first_player,
+            "init_draw_deck": [], "init_trump_card": list(trump_card),
+            "init_hands": [[list(card) for card in hand] for hand in hands]}
+    return foxintheforest.compact_state(foxintheforest.get_state_from_game(game))
+
+class TestRollout(unittest.TestCase):
+    def setUp(self):
+        self.epsilon = rollout.EPSILON
+        rollout.EPSILON = 0
+
+    def tearDown(self):
+        rollout.EPSILON = self.epsilon
+
+    def test_policies_play_allowed(self):
+        for policy in rollout.POLICIES.values():
+            random.seed(1)
+            for _ in range(50):
+                state = foxintheforest.get_state_from_game(foxintheforest.new_game())
+                cstate = foxintheforest.compact_state(state)
+                while cstate["hands"][0] or cstate["hands"][1]:
+                    allowed = foxintheforest.compact_list_allowed(cstate)
+                    play = policy(cstate, allowed)
+                    self.assertIn(play, allowed)
+                    foxintheforest.compact_do_step(cstate, play)
+
+    def test_follow(self):
+        hands = [[[2, 'h'], [6, 'h'], [8, 'h'], [10, 'h']], [[4, 'h'], [2, 'c'], [4, 's']]]
+        cstate = compact_deal(hands, [10, 'c'], 1, [[1, [4, 'h']]])
+        allowed = foxintheforest.compact_list_allowed(cstate)
+        self.assertTrue(rollout.wants_tricks(cstate, 0))
+        self.assertEqual(foxintheforest.int_to_play(rollout.heuristic_policy(cstate, allowed)),
+                         [0, [6, 'h']])
+        cstate["discards"][0] = (1 << 18) - 1
+        self.assertFalse(rollout.wants_tricks(cstate, 0))
+        self.assertEqual(foxintheforest.int_to_play(rollout.heuristic_policy(cstate, allowed)),
+                         [0, [2, 'h']])
+
+    def test_lead(self):
+        hands = [[[2, 'h'], [10, 'c'], [6, 's'], [8, 's']], [[4, 'h'], [2, 'c'], [4, 's']]]
+        cstate = compact_deal(hands, [4, 'c'], 0)
+        allowed = foxintheforest.compact_list_allowed(cstate)
+        self.assertEqual(foxintheforest.int_to_play(rollout.heuristic_policy(cstate, allowed)),
+                         [0, [8, 's']])
+        cstate["discards"][0] = (1 << 18) - 1
+        self.assertEqual(foxintheforest.int_to_play(rollout.heuristic_policy(cstate, allowed)),
+                         [0, [2, 'h']])
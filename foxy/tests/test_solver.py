@@ -0,0 +1,43 @@
+import unittest
+import random
+
+from foxy.engine import foxintheforest, solver, transposition
+
+def minimax(cstate, player):
+    if not cstate["hands"][0] and not cstate["hands"][1]:
+        score = foxintheforest.compact_get_score(cstate)
+        return score[player] - score[1 - player]
+    values = []
+    for step in foxintheforest.compact_list_allowed(cstate):
+        child = foxintheforest.copy_compact_state(cstate)
+        foxintheforest.compact_do_step(child, step)
+        values.append(minimax(child, player))
+    return max(values) if cstate["current_player"] == player else min(values)
+
+class TestSolver(unittest.TestCase):
+    def test_solve(self):
+        random.seed(2)
+        table = transposition.TranspositionTable(2 ** 8)
+        for _ in range(20):
+            cstate = foxintheforest.compact_state(
+                foxintheforest.get_state_from_game(foxintheforest.new_game()))
+            while cstate["hands"][0].bit_count() + cstate["hands"][1].bit_count() > 6:
+                foxintheforest.compact_do_step(cstate, random.choice(
+                    foxintheforest.compact_list_allowed(cstate)))
+            initial = foxintheforest.copy_compact_state(cstate)
+            for player in range(2):
+                expected = minimax(cstate, player)
+                self.assertEqual(solver.solve(cstate, player), expected)
+                self.assertEqual(cstate, initial)
+            for player in range(2):
+                self.assertEqual(solver.solve(cstate, player, table), minimax(cstate, player))
+
+    def test_solve_finished(self):
+        random.seed(2)
+        cstate = foxintheforest.compact_state(
+            foxintheforest.get_state_from_game(foxintheforest.new_game()))
+        while cstate["hands"][0] or cstate["hands"][1]:
+            foxintheforest.compact_do_step(cstate, random.choice(
+                foxintheforest.compact_list_allowed(cstate)))
+        score = foxintheforest.compact_get_score(cstate)
+        self.assertEqual(solver.solve(cstate, 1), score[1] - score[0])
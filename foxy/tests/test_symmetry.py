@@ -0,0 +1,70 @@
+import unittest
+import random
+
+from foxy.engine import foxintheforest, good_ai, symmetry
+from foxy.engine.symmetry import SUIT_PERMUTATIONS
+
+class TestSymmetry(unittest.TestCase):
+    def setUp(self):
+        random.seed(8)
+        self.games = []
+        for _ in range(5):
+            game_state = foxintheforest.GameState(foxintheforest.new_game())
+            while not game_state.is_finished():
+                player = game_state.state["current_player"]
+                self.games.append(foxintheforest.copy_game(game_state.game))
+                game_state.apply_play(random.choice(
+                    foxintheforest.list_allowed(game_state.state, player)))
+            self.games.append(foxintheforest.copy_game(game_state.game))
+
+    def test_permutations(self):
+        for permutation in SUIT_PERMUTATIONS:
+            inverse = symmetry.inverse_permutation(permutation)
+            for card in range(foxintheforest.NB_CARDS):
+                permuted = symmetry.CARD_PERMUTATIONS[permutation][card]
+                self.assertEqual(foxintheforest.CARD_VALUES[permuted],
+                                 foxintheforest.CARD_VALUES[card])
+                self.assertEqual(symmetry.CARD_PERMUTATIONS[inverse][permuted], card)
+                self.assertEqual(symmetry.permute_mask(1 << card, permutation), 1 << permuted)
+
+    def test_rules(self):
+        """Relabelled games are played as the original ones, with relabelled plays"""
+        for game in self.games:
+            state = foxintheforest.get_state_from_game(game)
+            player = state["current_player"]
+            for permutation in SUIT_PERMUTATIONS:
+                permuted = foxintheforest.get_state_from_game(
+                    symmetry.permute_game(game, permutation))
+                self.assertEqual(permuted, symmetry.permute_state(state, permutation))
+                self.assertEqual(foxintheforest.list_allowed(permuted, player),
+                                 [symmetry.permute_play(step, permutation)
+                                  for step in foxintheforest.list_allowed(state, player)])
+                self.assertEqual(foxintheforest.get_score(permuted),
+                                 foxintheforest.get_score(state))
+                self.assertEqual(foxintheforest.compact_state(permuted),
+                                 symmetry.permute_compact_state(
+                                     foxintheforest.compact_state(state), permutation))
+
+    def test_knowledge(self):
+        for game in self.games[::3]:
+            player = foxintheforest.get_state_from_game(game)["current_player"]
+            view = foxintheforest.get_player_game(game, player)
+            knowledge = good_ai.aquire_knowledge(foxintheforest.get_state_from_game(view))
+            for permutation in SUIT_PERMUTATIONS:
+                self.assertEqual(good_ai.aquire_knowledge(foxintheforest.get_state_from_game(
+                    symmetry.permute_game(view, permutation))),
+                                 symmetry.permute_knowledge(knowledge, permutation))
+
+    def test_canonical_game(self):
+        """Equivalent views have the same canonical form, with the trump suit first"""
+        for game in self.games[::3]:
+            for player in range(2):
+                view = foxintheforest.get_player_game(game, player)
+                canonical, permutation = symmetry.canonical_game(view)
+                self.assertEqual(canonical["init_trump_card"][1], foxintheforest.COLORS[0])
+                self.assertEqual(symmetry.permute_game(canonical,
+                                                       symmetry.inverse_permutation(permutation)),
+                                 view)
+                for other in SUIT_PERMUTATIONS:
+                    self.assertEqual(
+                        symmetry.canonical_game(symmetry.permute_game(view, other))[0], canonical)
@@ -0,0 +1,28 @@
+import unittest
+import time
+
+from foxy import tasks
+
+class FakeRedis():
+    """Counts the GET commands of the pondering key"""
+    def __init__(self):
+        self.values = {"foxy:ponder:1": b"1"}
+        self.nb_get = 0
+
+    def get(self, name):
+        self.nb_get += 1
+        return self.values.get(name)
+
+class TestPondering(unittest.TestCase):
+    def test_ponder_stop(self):
+        connection = FakeRedis()
+        stop = tasks.ponder_stop(connection, tasks.ponder_key(1))
+        self.assertFalse(stop())
+        for _ in range(1000):
+            self.assertFalse(stop())
+        # The server is not asked again before the check interval
+        self.assertEqual(connection.nb_get, 1)
+        del connection.values["foxy:ponder:1"]
+        time.sleep(tasks.PONDER_CHECK_INTERVAL)
+        self.assertTrue(stop())
+        self.assertEqual(connection.nb_get, 2)
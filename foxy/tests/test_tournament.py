@@ -0,0 +1,40 @@
+import unittest
+
+from foxy.engine import tournament
+
+class TestTournament(unittest.TestCase):
+    def test_parse_entry(self):
+        self.assertEqual(tournament.parse_entry("TheBad"), ("TheBad", {}))
+        self.assertEqual(tournament.parse_entry("TheGood:TURN_DURATION=0.5,NB_SIMUL_P0=20,K=1"),
+                         ("TheGood", {"duration": 0.5, "runs": 20, "k": 1.0}))
+        self.assertEqual(tournament.parse_entry("TheGood:ROLLOUT=random,LEAF_PLAYOUTS=32"),
+                         ("TheGood", {"rollout": "random", "playouts": 32}))
+        with self.assertRaises(ValueError):
+            tournament.parse_entry("TheUgly")
+        with self.assertRaises(ValueError):
+            tournament.parse_entry("TheGood:DEPTH=3")
+        # The random AI takes no setting
+        with self.assertRaisesRegex(ValueError, "TheBad takes no setting K"):
+            tournament.parse_entry("TheBad:K=1")
+
+    def test_wilson_interval(self):
+        low, high = tournament.wilson_interval(50, 100)
+        self.assertAlmostEqual(low + high, 1)
+        self.assertLess(low, 0.5)
+        self.assertGreater(low, 0.39)
+        self.assertEqual(tournament.wilson_interval(0, 10)[0], 0)
+
+    def test_play_game(self):
+        entries = (("TheBad", {}), ("TheGood", {"duration": 0, "runs": 5}))
+        result = tournament.play_game(entries, 3, False)
+        swapped = tournament.play_game((entries[1], entries[0]), 3, True)
+        self.assertEqual(sum(result["moves"]), sum(swapped["moves"]))
+        self.assertGreaterEqual(sum(result["moves"]), 26)
+
+    def test_run_tournament(self):
+        stats = tournament.run_tournament((("TheBad", {}), ("TheBad", {})), 6, 2, 1)
+        self.assertEqual(stats["wins"] + stats["draws"] + stats["losses"], 6)
+        self.assertGreater(stats["games_per_second"], 0)
+        low, high = stats["confidence_interval"]
+        self.assertLessEqual(low, stats["win_rate"])
+        self.assertLessEqual(stats["win_rate"], high)
@@ -0,0 +1,31 @@
+import unittest
+
+from foxy.engine.transposition import TranspositionTable
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_store_get(self):
+        table = TranspositionTable(16)
+        self.assertIsNone(table.get(5))
+        table.store(5, 4, 3, 0)
+        self.assertEqual(table.get(5), (3, 0))
+        # Same slot, different key
+        self.assertIsNone(table.get(21))
+        self.assertEqual(len(table), 1)
+
+    def test_replacement(self):
+        table = TranspositionTable(16)
+        table.store(5, 4, 3, 0)
+        table.store(21, 2, 1, 0)
+        self.assertEqual(table.get(5), (3, 0))
+        self.assertIsNone(table.get(21))
+        table.store(21, 4, 1, 0)
+        self.assertEqual(table.get(21), (1, 0))
+        self.assertIsNone(table.get(5))
+        table.store(21, 2, 2, 1)
+        self.assertEqual(table.get(21), (2, 1))
+        table.new_search()
+        table.store(5, 0, 3, 0)
+        self.assertEqual(table.get(5), (3, 0))
+        table.clear()
+        self.assertIsNone(table.get(5))
+        self.assertEqual(len(table), 0)
@@ -0,0 +1,39 @@
+import unittest
+
+from foxy.engine import foxintheforest
+from foxy.engine.tree import Tree, ROOT, NO_NODE
+
+class TestTree(unittest.TestCase):
+    def test_add_child(self):
+        tree = Tree()
+        play = foxintheforest.play_to_int([1, [7, 'h']])
+        child = tree.add_child(ROOT, play)
+        self.assertEqual(tree.children[ROOT * foxintheforest.NB_CARDS + (play & 63)], child)
+        self.assertEqual(tree.plays[child], play)
+        self.assertEqual(tree.parents[child], ROOT)
+        self.assertEqual(tree.get_children(ROOT), [child])
+        self.assertEqual(tree.get_children(child), [])
+        self.assertEqual(len(tree), 2)
+
+    def test_max_nodes(self):
+        tree = Tree(3)
+        self.assertNotEqual(tree.add_child(ROOT, 1), NO_NODE)
+        self.assertNotEqual(tree.add_child(ROOT, 2), NO_NODE)
+        self.assertEqual(tree.add_child(ROOT, 3), NO_NODE)
+        self.assertEqual(len(tree), 3)
+
+    def test_subtree(self):
+        tree = Tree()
+        child = tree.add_child(ROOT, 1)
+        grandchildren = [tree.add_child(child, 64 | card) for card in (4, 2)]
+        tree.add_child(ROOT, 3)
+        tree.add_child(grandchildren[0], 5)
+        tree.visits[grandchildren[1]] = 7
+        subtree = tree.subtree(child)
+        self.assertEqual(len(subtree), 4)
+        self.assertEqual(subtree.plays[ROOT], 1)
+        self.assertEqual(sorted(subtree.plays[node] for node in subtree.get_children(ROOT)),
+                         [64 | 2, 64 | 4])
+        new_child = subtree.children[ROOT * foxintheforest.NB_CARDS + 2]
+        self.assertEqual(subtree.visits[new_child], 7)
+        self.assertEqual(subtree.parents[new_child], ROOT)
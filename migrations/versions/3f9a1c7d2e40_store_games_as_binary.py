@@ -0,0 +1,46 @@
+"""Store Games.game in the compact binary format.
+
+Revision ID: 3f9a1c7d2e40
+Revises: b65c12e7bf53
+Create Date: 2026-10-18 10:12:41.503128
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c7d2e40'
+down_revision = 'b65c12e7bf53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows keep their json dump, foxintheforest.decode_game() still reads it
+    # and they are stored in the binary format on their next update
+    with op.batch_alter_table('games', schema=None) as batch_op:
+        batch_op.alter_column('game',
+               existing_type=sa.String(length=1000),
+               type_=sa.LargeBinary(),
+               existing_nullable=True,
+               postgresql_using="convert_to(game, 'UTF8')")
+
+
+def downgrade():
+    from foxy.engine.foxintheforest import decode_game
+    import json
+
+    # Back to json dumps before going back to text
+    games = sa.table('games', sa.column('id', sa.Integer), sa.column('game', sa.LargeBinary))
+    connection = op.get_bind()
+    for game_id, data in connection.execute(sa.select(games.c.id, games.c.game)).fetchall():
+        if data is not None:
+            connection.execute(games.update().where(games.c.id == game_id)
+                               .values(game=json.dumps(decode_game(data)).encode()))
+    with op.batch_alter_table('games', schema=None) as batch_op:
+        batch_op.alter_column('game',
+               existing_type=sa.LargeBinary(),
+               type_=sa.String(length=1000),
+               existing_nullable=True,
+               postgresql_using="convert_from(game, 'UTF8')")